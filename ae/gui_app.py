@@ -103,6 +103,13 @@ depending on the app state :ref:`config-variables` detected in all the
 The names of the available application state variables can be
 determined with the helper function :func:`app_state_keys`.
 
+The :class:`AppStateStore` instance in the :attr:`~MainAppBase.state_store`
+attribute of the main app determines these names only once on each load of
+the config files and records a version for each change of an app state
+variable done via :meth:`~MainAppBase.change_app_state`, for to provide
+cheap snapshots of all app state values (:meth:`AppStateStore.snapshot`)
+or only of the ones changed since a given version (:meth:`AppStateStore.delta`).
+
 :class:`MainBaseApp` provides optionally a user-defined font size to your application
 if it detect the app state variable :attr:`~MainAppBase.font_size`. The method
 :meth:`set_font_size` has to be called when the user has changed the font size
@@ -126,10 +133,28 @@ Changed app state value that need to be propagated also to the framework
 app instance should be set not via the instance attribute, instead call
 the method :meth:`~MainBaseApp.change_app_state` (which ensures the
 propagation to any duplicated value in a (bound) framework property).
+For to change several app state variables at once use the method
+:meth:`~MainBaseApp.change_app_states`, which propagates all of them
+together in a single update of the framework app.
 
 For to to save the app state to the :ref:`config-files` the implementing main app
 instance has to call the method :meth:`~MainBaseApp.save_app_states` - this could be
 done e.g. after the app state has changed or at least on quiting the application.
+For to save the app states in a background thread, first freeze them in the thread
+of the GUI framework with :meth:`~MainAppBase.prepare_app_states_save`, then pass
+the result to :meth:`~MainAppBase.write_app_states` (only doing the file I/O) in
+the background thread and finally call :meth:`~MainAppBase.app_states_saved` back
+in the thread of the GUI framework, for to reload the config files.
+
+If the attribute :attr:`~MainAppBase.app_state_snapshot` of the main app is
+True then the decoded app state values get additionally stored in a binary
+snapshot file (with the extension :data:`APP_STATE_SNAPSHOT_EXT`), besides the
+main config file. The snapshot is keyed by the size and modification time of
+all config files and by the snapshot and app version, so that an unchanged
+config gets loaded with a single deserialization. If any of the config
+files got changed (e.g. edited externally) then only the app state values
+with a changed config literal get decoded again. On save the snapshot gets
+written directly from the current app state values, without decoding them.
 
 
 application context
@@ -168,22 +193,68 @@ Internally is this method used for to fire the event `on_context_draw()`
 automatically after a change of the :ref:`application context` or if
 the user changed the font size.
 
+All events are dispatched by the :class:`EventBus` instance in the
+:attr:`~MainAppBase.event_bus` attribute of the main app. Besides the
+event method of the main app instance, any plugin or widget can subscribe
+its own callback to an event with :meth:`EventBus.subscribe`, e.g.::
+
+    main_app.event_bus.subscribe('on_key_press', my_key_handler, priority=9)
+
+Callbacks with a higher priority will be called first. The first callback
+returning a value that evaluates as True stops the dispatch of an event and
+its return value gets returned by :meth:`~MainAppBase.call_event`.
+
+
+hot path timings
+----------------
+
+The :class:`HotPathTimings` instance in the :attr:`~MainAppBase.timings`
+attribute of the main app keeps the durations of the most recent calls of
+each event and of other hot paths (like :meth:`~MainAppBase.save_app_states`)
+in a ring buffer. The timings get only recorded if the app got started with
+the debug level :data:`~ae.core.DEBUG_LEVEL_TIMESTAMPED`; otherwise
+:meth:`HotPathTimings.measure` returns a shared no-op context manager.
+
+Call :meth:`~MainAppBase.show_timings` for to display the count, the p50,
+p95 and maximum duration of each timed hot path and for to optionally dump
+them into a file.
+
+The durations of the app startup phases (updater check, config load, app
+state load and app init) are recorded in :attr:`~MainAppBase.startup_phases`.
+A framework integration calls :meth:`~MainAppBase.on_first_frame` after the
+first frame got displayed for to record the last phase and to print the
+time to the first frame as debug output. Non-essential initializations can
+be deferred by implementing the event `on_app_first_frame()`.
+
+.. note:
+    The updater checks of :func:`ae.updater.check_all` are done on the
+    instantiation of the main app, before the config files get loaded.
+
 """
+import os
+import pickle
+import threading
 from abc import ABC, abstractmethod
+from collections import deque
 from configparser import ConfigParser, NoSectionError
-from typing import Any, Dict, Tuple, List
+from contextlib import nullcontext
+from time import perf_counter
+from typing import Any, Callable, ContextManager, Deque, Dict, Tuple, List, Union
 
-from ae.core import DEBUG_LEVEL_VERBOSE         # type: ignore
+from ae.core import DEBUG_LEVEL_TIMESTAMPED, DEBUG_LEVEL_VERBOSE  # type: ignore
 from ae.updater import check_all                # type: ignore
 from ae.literal import Literal                  # type: ignore
 from ae.console import ConsoleApp               # type: ignore
 
 
 AppStateType = Dict[str, Any]           #: app state config variable type
+EventCallbackType = Callable[..., Any]  #: event callback type
+AppStateSaveType = Tuple[int, Dict[str, Any], bytes]    #: save sequence number, config literals and snapshot data
 
 APP_STATE_SECTION_NAME = 'aeAppState'   #: config section name for to store app state
-
-check_all()
+APP_STATE_SNAPSHOT_EXT = '.snapshot'   #: file extension of the binary snapshot of the decoded app state values
+APP_STATE_SNAPSHOT_VERSION = 2          #: version of the snapshot file format (stored in the snapshot key)
+TIMING_SAMPLES = 369                    #: number of the most recent durations kept for each timed hot path
 
 
 def app_state_keys(cfg_parser: ConfigParser) -> Tuple:
@@ -199,6 +270,209 @@ def app_state_keys(cfg_parser: ConfigParser) -> Tuple:
         return tuple()
 
 
+def app_state_literal(value: Any) -> str:
+    """ determine the config literal of an app state value, like it gets read back after its save.
+
+    :param value:           app state value.
+    :return:                config literal string (in the format of :meth:`~ae.console.ConsoleApp.set_var`).
+    """
+    if isinstance(value, (dict, list, tuple)):
+        return "'''" + repr(value) + "'''"
+    return str(value)
+
+
+class AppStateStore:
+    """ cached key set and change-tracking of the app state variables of a main app. """
+    def __init__(self, owner: Any):
+        """ create store instance.
+
+        :param owner:       main app instance holding the app state values in its attributes.
+        """
+        self.owner = owner
+        self.keys: Tuple[str, ...] = tuple()        #: app state keys of the loaded config files
+        self.version = 0                            #: version of the last recorded change
+        self.key_versions: Dict[str, int] = dict()  #: version of the last recorded change of each app state variable
+
+    def load_keys(self, cfg_parser: ConfigParser):
+        """ determine the app state keys, to be called after each (re-)load of the config files.
+
+        :param cfg_parser:  instance of the :class:`~configparser.ConfigParser` of the main app.
+        """
+        self.keys = app_state_keys(cfg_parser)
+
+    def changed(self, key: str) -> int:
+        """ record change of an app state variable.
+
+        :param key:         name of the changed app state variable.
+        :return:            new version of the app state.
+        """
+        self.version += 1
+        self.key_versions[key] = self.version
+        return self.version
+
+    def snapshot(self) -> AppStateType:
+        """ return dict with the current values of all app state variables. """
+        owner = self.owner
+        return {key: getattr(owner, key) for key in self.keys}
+
+    def delta(self, since_version: int) -> AppStateType:
+        """ return dict with the current values of the app state variables changed after the specified version.
+
+        :param since_version: app state version (e.g. a value of :attr:`.version` remembered earlier).
+        :return:            dict with the changed app state variables.
+        """
+        owner = self.owner
+        key_versions = self.key_versions
+        return {key: getattr(owner, key) for key in self.keys if key_versions.get(key, 0) > since_version}
+
+
+class EventBus:
+    """ event dispatcher with cached handler resolution, handler priorities and short-circuit return values. """
+    def __init__(self, owner: Any = None):
+        """ create event bus instance.
+
+        :param owner:   object providing the default event handlers: the method of the owner with the same name as
+                        the event (e.g. on_context_draw) gets called with the priority 0.
+        """
+        self.owner = owner
+        self._subscriptions: Dict[str, List[Tuple[int, EventCallbackType]]] = dict()
+        self._handlers: Dict[str, Tuple[EventCallbackType, ...]] = dict()   # resolved/sorted handlers cache
+
+    def _resolve(self, event: str) -> Tuple[EventCallbackType, ...]:
+        """ determine and cache the handlers of an event, sorted by their priority.
+
+        The handlers of an event without an owner handler are not cached, because the handler could be attached to
+        the owner instance later.
+        """
+        subscriptions = list(self._subscriptions.get(event, ()))
+        owner_callback = getattr(self.owner, event, None)
+        if owner_callback:
+            subscriptions.insert(0, (0, owner_callback))
+        handlers = tuple(callback for _, callback in sorted(subscriptions, key=lambda _: -_[0]))
+        if owner_callback or self.owner is None:
+            self._handlers[event] = handlers
+        return handlers
+
+    def dispatch(self, event: str, *args, **kwargs) -> Any:
+        """ call the handlers of an event in the order of their priority until one returns a True value.
+
+        :param event:   name of the event.
+        :param args:    positional arguments passed to the handlers.
+        :param kwargs:  keyword arguments passed to the handlers.
+        :return:        first return value that evaluates as True or the return value of the last called handler
+                        or None if the event has no handlers.
+        """
+        handlers = self._handlers.get(event)
+        if handlers is None:
+            handlers = self._resolve(event)
+
+        ret = None
+        for handler in handlers:
+            ret = handler(*args, **kwargs)
+            if ret:
+                break
+        return ret
+
+    def subscribe(self, event: str, callback: EventCallbackType, priority: int = 0):
+        """ add callback to the handlers of an event.
+
+        :param event:       name of the event.
+        :param callback:    callable to be called on dispatch of the event.
+        :param priority:    handlers with higher priority get called first (the owner handler has the priority 0).
+        """
+        self._subscriptions.setdefault(event, list()).append((priority, callback))
+        self._handlers.pop(event, None)
+
+    def unsubscribe(self, event: str, callback: EventCallbackType):
+        """ remove callback from the handlers of an event.
+
+        :param event:       name of the event.
+        :param callback:    callable previously subscribed to the event.
+        """
+        self._subscriptions[event] = [_ for _ in self._subscriptions.get(event, ()) if _[1] != callback]
+        self._handlers.pop(event, None)
+
+
+class _TimedBlock:
+    """ context manager adding the duration of its block to the ring buffer of a timed hot path. """
+    __slots__ = ('durations', 'start')
+
+    def __init__(self, durations: Deque[float]):
+        self.durations = durations
+        self.start = 0.0
+
+    def __enter__(self):
+        self.start = perf_counter()
+
+    def __exit__(self, *_):
+        self.durations.append(perf_counter() - self.start)
+
+
+_NO_TIMING = nullcontext()      # shared no-op context manager returned by HotPathTimings.measure() if disabled
+
+
+class HotPathTimings:
+    """ ring buffers of the durations of the timed hot paths, with their p50/p95/max statistics. """
+    def __init__(self, samples: int = TIMING_SAMPLES):
+        """ create timings instance (disabled by default).
+
+        :param samples:     maximum number of the most recent durations kept for each hot path.
+        """
+        self.enabled = False
+        self.samples = samples
+        self.durations: Dict[str, Deque[float]] = dict()
+
+    def measure(self, name: str) -> ContextManager:
+        """ return context manager for to time the duration of the block within the with statement.
+
+        :param name:        name of the timed hot path.
+        :return:            context manager recording the duration of its block if the timings are enabled.
+        """
+        if not self.enabled:
+            return _NO_TIMING
+        durations = self.durations.get(name)
+        if durations is None:
+            durations = self.durations[name] = deque(maxlen=self.samples)
+        return _TimedBlock(durations)
+
+    def statistics(self) -> Dict[str, Tuple[int, float, float, float]]:
+        """ determine the statistics of all timed hot paths.
+
+        :return:            dict with the hot path names as keys and a tuple of the sample count and
+                            the p50, p95 and maximum duration in seconds as values.
+        """
+        stats = dict()
+        for name, durations in self.durations.items():
+            if durations:
+                values = sorted(durations)
+                last_idx = len(values) - 1
+                stats[name] = (len(values), values[last_idx // 2], values[round(last_idx * 0.95)], values[-1])
+        return stats
+
+    def report(self) -> str:
+        """ return the statistics of all timed hot paths as text table (durations in milliseconds). """
+        lines = [f"{'hot path':<24} {'count':>6} {'p50':>9} {'p95':>9} {'max':>9}"]
+        for name, (count, p50, p95, max_dur) in sorted(self.statistics().items()):
+            lines.append(f"{name[:24]:<24} {count:>6} {p50 * 1000:9.3f} {p95 * 1000:9.3f} {max_dur * 1000:9.3f}")
+        return "\n".join(lines)
+
+    def dump(self, file_path: str, prefix: str = "") -> str:
+        """ write the report of the statistics of all timed hot paths into a file.
+
+        :param file_path:   path of the file to write to (will be overwritten).
+        :param prefix:      optional text line written in front of the report.
+        :return:            error message or empty string if no error occurred.
+        """
+        try:
+            with open(file_path, 'w') as file_handle:
+                if prefix:
+                    file_handle.write(prefix + "\n")
+                file_handle.write(self.report() + "\n")
+        except OSError as ex:
+            return f"HotPathTimings.dump({file_path}) error: {ex}"
+        return ""
+
+
 class MainAppBase(ConsoleApp, ABC):
     """ abstract base class for to implement a GUIApp-conform app class """
     # app states
@@ -207,10 +481,19 @@ class MainAppBase(ConsoleApp, ABC):
     font_size: float = 30.                                  #: font size used for toolbar and context screens
 
     # generic run-time shortcut references provided by the main app
+    event_bus: EventBus                                     #: dispatcher of the app events
+    state_store: AppStateStore                              #: key set and change-tracking of the app states
+    timings: HotPathTimings                                 #: durations of the app events and other hot paths
+    startup_phases: Dict[str, float]                        #: durations of the app startup phases
     framework_app: Any = None                               #: app class instance of the used GUI framework
     debug_bubble: bool = False                              #: visibility of a popup/bubble showing debugging info
+    app_state_snapshot: bool = False                        #: True for to cache the decoded app states in a snapshot
     info_bubble: Any = None                                 #: optional DebugBubble widget
 
+    _save_lock: threading.Lock                              #: serializes the writes of the app states
+    _save_seq: int = 0                                      #: sequence number of the last prepared app states save
+    _saved_seq: int = 0                                     #: sequence number of the last written app states save
+
     root_win: Any = None                                    #: app window
     root_layout: Any = None                                 #: app root layout
 
@@ -220,11 +503,23 @@ class MainAppBase(ConsoleApp, ABC):
         :param debug_bubble:
         :param console_app_kwargs:
         """
+        self._phase_start = perf_counter()
+        self.startup_phases = dict()
+        self.event_bus = EventBus(owner=self)
+        self.state_store = AppStateStore(owner=self)
+        self.timings = HotPathTimings()
+        self._save_lock = threading.Lock()
         self.context_path = list()  # init for Literal type recognition - will be overwritten by setup_app_states()
         self.debug_bubble = debug_bubble
+
+        check_all()
+        self.record_startup_phase('updater_check')
         super().__init__(**console_app_kwargs)
+        self.record_startup_phase('config_load')
         self.load_app_states()
+        self.record_startup_phase('app_state_load')
         self.on_app_init()
+        self.record_startup_phase('app_init')
 
     # abstract methods
 
@@ -239,17 +534,25 @@ class MainAppBase(ConsoleApp, ABC):
     # base implementation helper methods (can be overwritten by framework portion or by user main app)
 
     def call_event(self, method: str, *args, **kwargs) -> Any:
-        """ dispatch event to inheriting instances. """
-        event_callback = getattr(self, method, None)
-        if event_callback:
-            return event_callback(*args, **kwargs)
-        return None
+        """ dispatch event to inheriting instances and to the subscribers of the event (see :class:`EventBus`). """
+        with self.timings.measure(method):
+            return self.event_bus.dispatch(method, *args, **kwargs)
 
     def change_app_state(self, state_name: str, new_value: Any):
         """ change single app state item to value in self.attribute and app_state dict item. """
-        setattr(self, state_name, new_value)
-        if self.framework_app and self.framework_app.app_state:     # if framework needs duplicate DictProperty
-            self.framework_app.app_state[state_name] = new_value
+        self.change_app_states(**{state_name: new_value})
+
+    def change_app_states(self, **app_states: Any):
+        """ change several app state items at once, propagating them together to the framework app.
+
+        :param app_states:  names and new values of the changed app state variables as keyword arguments.
+        """
+        store = self.state_store
+        for state_name, new_value in app_states.items():
+            setattr(self, state_name, new_value)
+            store.changed(state_name)
+        if self.framework_app and self.framework_app.app_state is not None:    # if framework needs duplicate dict
+            self.framework_app.app_state.update(app_states)
 
     def context_enter(self, context_id: str, next_context_id: str = ''):
         """ user extending/entering/adding new context_id (e.g. navigates down in the app context path/tree) """
@@ -261,56 +564,180 @@ class MainAppBase(ConsoleApp, ABC):
         list_name = self.context_path.pop()
         self.set_context(next_context_id or list_name)
 
-    def load_app_states(self):
-        """ load application state for to prepare app.run_app """
-        self.debug_bubble = self.get_opt('debugLevel') >= DEBUG_LEVEL_VERBOSE
+    def decode_app_states(self) -> AppStateType:
+        """ decode the app state values from the config literals or (if enabled and up-to-date) from the snapshot.
 
+        :return:            dict with the decoded app state values.
+        """
         app_state = dict()
         try:            # if self._cfg_parser.has_section(APP_STATE_SECTION_NAME):
             items = self._cfg_parser.items(APP_STATE_SECTION_NAME)
+        except NoSectionError:
+            self.dpo(f"MainAppBase.decode_app_states: ignoring missing config file section {APP_STATE_SECTION_NAME}")
+            return app_state
+
+        if not self.app_state_snapshot:
             for key, state in items:
                 lit = Literal(state)        # not working for str literals: , value_type=type(getattr(self, key, "")))
                 app_state[key] = lit.value
-        except NoSectionError:
-            self.dpo(f"MainAppBase.load_app_states: ignoring missing config file section {APP_STATE_SECTION_NAME}")
+            return app_state
+
+        snapshot_key = self._snapshot_key()
+        old_key, old_states = self._read_snapshot()
+        if old_key == snapshot_key:
+            return {key: value for key, (_, value) in old_states.items()}
+
+        states = dict()
+        for key, state in items:
+            old_state = old_states.get(key)
+            states[key] = old_state if old_state and old_state[0] == state else (state, Literal(state).value)
+            app_state[key] = states[key][1]
+        self._write_snapshot(snapshot_key, pickle.dumps(states, protocol=pickle.HIGHEST_PROTOCOL))
+        return app_state
+
+    def lazy_dpo(self, message: Union[str, Callable[[], str]], *args,
+                 minimum_debug_level: int = DEBUG_LEVEL_VERBOSE):
+        """ debug print-out with deferred formatting, for to be used in hot paths.
 
-        self.setup_app_states(app_state)
+        :param message:             format template (in the syntax of :meth:`str.format`) of the passed args or
+                                    callable returning the message text.
+        :param args:                arguments for the format template.
+        :param minimum_debug_level: minimum debug level for to format and print the message.
+        """
+        if self.debug_level >= minimum_debug_level:
+            self.po(message() if callable(message) else message.format(*args))
+
+    def load_app_states(self):
+        """ load application state for to prepare app.run_app """
+        debug_level = self.get_opt('debugLevel')
+        self.debug_bubble = debug_level >= DEBUG_LEVEL_VERBOSE
+        self.timings.enabled = debug_level >= DEBUG_LEVEL_TIMESTAMPED
+
+        with self.timings.measure('load_app_states'):
+            self.state_store.load_keys(self._cfg_parser)
+            self.setup_app_states(self.decode_app_states())
+
+    def _snapshot_file_path(self) -> str:
+        """ determine the file path of the app state snapshot, besides the main config file. """
+        return os.path.splitext(self._main_cfg_fnam)[0] + APP_STATE_SNAPSHOT_EXT
+
+    def _snapshot_key(self) -> Tuple:
+        """ determine key of the app state snapshot from the snapshot/app version and the stats of the config files. """
+        stats = list()
+        for cfg_fnam in self._cfg_files:
+            if os.path.isfile(cfg_fnam):
+                stat = os.stat(cfg_fnam)
+                stats.append((cfg_fnam, stat.st_size, stat.st_mtime_ns))
+        return APP_STATE_SNAPSHOT_VERSION, self.app_version, tuple(stats)
+
+    def _read_snapshot(self) -> Tuple[Tuple, Dict[str, Tuple[str, Any]]]:
+        """ read app state snapshot, returning its key and the config literals and decoded values of the app states. """
+        try:
+            with open(self._snapshot_file_path(), 'rb') as file_handle:
+                snapshot_key, states_data = pickle.load(file_handle)
+            return snapshot_key, pickle.loads(states_data)
+        except FileNotFoundError:
+            pass
+        except Exception as ex:         # corrupted or incompatible snapshot
+            self.dpo(f"MainAppBase._read_snapshot: ignoring invalid app state snapshot: {ex}")
+        return tuple(), dict()
+
+    def _write_snapshot(self, snapshot_key: Tuple, states_data: bytes):
+        """ write app state snapshot with the pickled config literals and decoded values of the app states. """
+        try:
+            with open(self._snapshot_file_path(), 'wb') as file_handle:
+                pickle.dump((snapshot_key, states_data), file_handle, protocol=pickle.HIGHEST_PROTOCOL)
+        except (OSError, pickle.PicklingError) as ex:
+            self.dpo(f"MainAppBase._write_snapshot: app state snapshot not saved: {ex}")
+
+    def on_first_frame(self):
+        """ called by the framework integration after the first frame got displayed. """
+        self.record_startup_phase('first_frame')
+        self.lazy_dpo(self.startup_report)
+        self.call_event('on_app_first_frame')
 
     @staticmethod
     def play_beep():
         """ make a short beep sound, should be overwritten by GUI framework. """
         print(chr(7), "BEEP")
 
+    def record_startup_phase(self, phase: str):
+        """ record the duration of a startup phase (since the end of the previous phase).
+
+        :param phase:       name of the finished startup phase.
+        """
+        now = perf_counter()
+        self.startup_phases[phase] = now - self._phase_start
+        self._phase_start = now
+
     def retrieve_app_states(self) -> AppStateType:
         """ determine the state of a running app and return it as dict """
-        app_state = dict()
-        for key in app_state_keys(self._cfg_parser):
-            app_state[key] = getattr(self, key)
+        return self.state_store.snapshot()
 
-        return app_state
+    def prepare_app_states_save(self) -> AppStateSaveType:
+        """ freeze the current app state values for to be written by :meth:`.write_app_states`.
 
-    def save_app_states(self) -> str:
-        """ save app state in config file """
+        Has to be called in the thread of the GUI framework, because the mutable app state values get converted here
+        into their config literals and snapshot data, so that later changes are not affecting the saved values.
+
+        :return:            tuple of the sequence number of this save, the config literals (or the immutable values)
+                            of the app states and the pickled snapshot data (empty if the snapshot is disabled).
+        """
+        literals = dict()
+        states = dict()
+        for key, value in self.retrieve_app_states().items():
+            literal = app_state_literal(value)
+            literals[key] = literal.replace('%', '%%') if isinstance(value, (dict, list, tuple)) else value
+            states[key] = (literal, value)
+            self.lazy_dpo("save_app_state {}={}", key, value)
+        self._save_seq += 1
+        states_data = pickle.dumps(states, protocol=pickle.HIGHEST_PROTOCOL) if self.app_state_snapshot else b""
+        return self._save_seq, literals, states_data
+
+    def write_app_states(self, save_data: AppStateSaveType) -> str:
+        """ write the prepared app states into the main config file and the snapshot (only file I/O, thread-safe).
+
+        :param save_data:   app states prepared by :meth:`.prepare_app_states_save`.
+        :return:            error message or empty string if no error occurred.
+        """
+        save_seq, literals, states_data = save_data
         err_msg = ""
+        with self._save_lock:
+            if save_seq <= self._saved_seq:
+                return err_msg      # more recent app states got already written by another thread
+            for key, literal in literals.items():
+                err_msg = self.set_var(key, literal, section=APP_STATE_SECTION_NAME)
+                if err_msg:
+                    return err_msg
+            if states_data:
+                self._write_snapshot(self._snapshot_key(), states_data)
+            self._saved_seq = save_seq
+        return err_msg
 
-        app_state = self.retrieve_app_states()
-        for key, state in app_state.items():
-            err_msg = self.set_var(key, state, section=APP_STATE_SECTION_NAME)
-            self.dpo(f"save_app_state {key}={state} {err_msg or 'OK'}")
-            if err_msg:
-                break
+    def app_states_saved(self, err_msg: str) -> str:
+        """ reload the written config files, to be called in the thread of the GUI framework after each save.
+
+        :param err_msg:     error message returned by :meth:`.write_app_states`.
+        :return:            the passed error message.
+        """
+        self.lazy_dpo("save_app_states {}", err_msg or 'OK')
         self.load_cfg_files()
+        self.state_store.load_keys(self._cfg_parser)
         return err_msg
 
+    def save_app_states(self) -> str:
+        """ save app state in config file """
+        with self.timings.measure('save_app_states'):
+            return self.app_states_saved(self.write_app_states(self.prepare_app_states_save()))
+
     def set_context(self, context_id: str, redraw: bool = True):
         """ propagate change of context path and context/current id/item and display changed context.
 
         :param context_id:  name of new current item.
         :param redraw:      pass False to prevent to redraw the context screens.
         """
-        self.dpo(f"set_context({context_id})")
-        self.change_app_state('context_path', self.context_path)
-        self.change_app_state('context_id', context_id)
+        self.lazy_dpo("set_context({})", context_id)
+        self.change_app_states(context_path=self.context_path, context_id=context_id)
         if redraw:
             self.call_event('on_context_draw')
 
@@ -319,7 +746,22 @@ class MainAppBase(ConsoleApp, ABC):
         self.change_app_state('font_size', font_size)
         self.call_event('on_context_draw')
 
+    def show_timings(self, file_path: str = "") -> str:
+        """ display the startup phases and the statistics of the timed hot paths, overwrite for to show them in GUI.
+
+        :param file_path:   optional path of a file to dump the startup phases and the statistics into.
+        :return:            error message or empty string if no error occurred.
+        """
+        self.po(self.startup_report())
+        self.po(self.timings.report())
+        return self.timings.dump(file_path, prefix=self.startup_report()) if file_path else ""
+
+    def startup_report(self) -> str:
+        """ return the durations of the recorded startup phases and their total (in milliseconds) as text line. """
+        phases = self.startup_phases
+        return "startup " + " ".join(f"{phase}={dur * 1000:.1f}" for phase, dur in phases.items()) \
+            + f" total={sum(phases.values()) * 1000:.1f}ms"
+
     def setup_app_states(self, app_state: AppStateType):
         """ put app state variables into main app instance for to prepare framework app.run_app """
-        for key in app_state_keys(self._cfg_parser):
-            self.change_app_state(key, app_state[key])
+        self.change_app_states(**{key: app_state[key] for key in self.state_store.keys})
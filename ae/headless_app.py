@@ -0,0 +1,64 @@
+""" GUIApp-conform headless app without any GUI framework, e.g. for to run/benchmark the app logic in CI """
+from collections import deque
+from typing import Any, Deque, Tuple
+
+from ae.gui_app import AppStateType, MainAppBase
+
+
+ScriptedEventType = Tuple[str, Tuple[Any, ...]]    #: scripted event name and the positional arguments of its call
+
+
+class HeadlessFrameworkApp:
+    """ no-op framework app class, providing the scripted event loop """
+    def __init__(self, main_app: 'HeadlessMainApp'):
+        """ init headless app """
+        self.main_app = main_app
+        self.app_state: AppStateType = dict()               #: duplicate of MainAppBase app state attributes
+        self.events: Deque[ScriptedEventType] = deque()     #: queue of the scripted events
+        self.running = False                                #: True while the event loop is running
+
+    def init_app_state(self, app_state: AppStateType):
+        """ copy the app state variables into the duplicate app_state dict. """
+        self.app_state.update(app_state)
+
+    def run(self) -> int:
+        """ run scripted event loop until the event queue is empty or :meth:`.stop` got called.
+
+        :return:            number of processed events.
+        """
+        main_app = self.main_app
+        main_app.call_event('on_app_start')
+        count = 0
+        self.running = True
+        while self.running and self.events:
+            event, args = self.events.popleft()
+            main_app.call_event(event, *args)
+            count += 1
+        self.running = False
+        main_app.save_app_states()
+        main_app.call_event('on_app_stop')
+        return count
+
+    def stop(self):
+        """ stop the event loop after the currently processed event. """
+        self.running = False
+
+
+class HeadlessMainApp(MainAppBase):
+    """ headless application """
+    def on_app_init(self):
+        """ initialize framework app instance """
+        self.framework_app = HeadlessFrameworkApp(self)
+        self.framework_app.init_app_state(self.retrieve_app_states())
+
+    def run_app(self) -> str:
+        """ run the scripted events and return the number of the processed events as string """
+        return str(self.framework_app.run())
+
+    def script_event(self, event: str, *args):
+        """ append event to the scripted events processed by :meth:`.run_app`.
+
+        :param event:       name of the event or of the main app method to call.
+        :param args:        positional arguments passed to the event handlers.
+        """
+        self.framework_app.events.append((event, args))
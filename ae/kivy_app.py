@@ -1,17 +1,32 @@
 """ GUIApp-conform Kivy app """
+import asyncio
+import copyreg
+import hashlib
+import marshal
 import os
-from typing import Optional, TextIO
+import pickle
+import sys
+from collections import deque
+from importlib.util import MAGIC_NUMBER
+from time import perf_counter
+from types import CodeType
+from typing import Any, Callable, Deque, Dict, Optional, Set, TextIO, Tuple
 
 import kivy                                                             # type: ignore
 from kivy.app import App                                                # type: ignore
+from kivy.atlas import Atlas                                            # type: ignore
+from kivy.cache import Cache                                            # type: ignore
 from kivy.core.window import Window                                     # type: ignore
 from kivy.factory import Factory                                        # type: ignore
-from kivy.properties import BooleanProperty, DictProperty               # type: ignore
+from kivy.properties import BooleanProperty, ObjectProperty             # type: ignore
 from kivy.clock import Clock                                            # type: ignore
 from kivy.metrics import sp                                             # type: ignore
 from kivy.lang import Builder                                           # type: ignore
+from kivy.lang import builder as kv_builder                             # type: ignore
+from kivy.lang.parser import Parser                                     # type: ignore
+from kivy.resources import resource_find                                # type: ignore
 
-from ae.gui_app import MainAppBase
+from ae.gui_app import AppStateType, MainAppBase
 
 kivy.require('1.9.1')  # currently using 1.11.1 but at least 1.9.1 is needed for Window.softinput_mode 'below_target'
 # Window.softinput_mode = 'below_target'  # ensure android keyboard is not covering Popup/text input
@@ -20,6 +35,15 @@ kivy.require('1.9.1')  # currently using 1.11.1 but at least 1.9.1 is needed for
 MIN_FONT_SIZE = sp(21)
 MAX_FONT_SIZE = sp(33)
 
+BUBBLE_MESSAGES = 12                    #: maximum number of the latest messages displayed in the debug bubble
+BUBBLE_RENDER_INTERVAL = 0.3            #: minimum time in seconds between two renderings of the debug bubble
+BUBBLE_SHOW_TIME = 9.0                  #: time in seconds the debug bubble is shown after the last message
+
+KV_CACHE_EXT = '.kvc'                   #: file extension of the compiled kv rules cache files
+KV_CACHE_VERSION = 1                    #: version of the kv rules cache file format (stored in the cache key)
+#: attributes of the kivy Parser used by the Builder, checked on cache load for a fallback on incompatible changes
+KV_PARSER_ATTRIBUTES = ('directives', 'dynamic_classes', 'execute_directives', 'root', 'rules', 'templates')
+
 
 # adapted from: https://stackoverflow.com/questions/23055696
 #    /see-output-of-print-statements-on-android-using-kivy-kivy-launcher
@@ -38,32 +62,144 @@ DEBUG_BUBBLE_DEF = '''
 '''
 
 
+class _KvPickler(pickle.Pickler):
+    """ pickler for the compiled kv rules, serializing the code objects of the kv rule expressions via marshal. """
+    dispatch_table = copyreg.dispatch_table.copy()
+    dispatch_table[CodeType] = lambda code: (marshal.loads, (marshal.dumps(code), ))
+
+
+def load_kv_cached(kv_file: str, cache_file: str) -> Tuple[Any, float, float]:
+    """ load kv file into the kivy Builder, using the compiled kv rules of the cache file if it is up-to-date.
+
+    The rules of the cache file get merged by temporarily replacing the private Parser reference of the kivy Builder
+    module. If this is not possible (e.g. because of internal changes in a new kivy version), or if the cache file
+    is missing, outdated or not readable, then the kv file gets loaded with the public Builder API.
+
+    :param kv_file:     path of the kv file to load.
+    :param cache_file:  path of the cache file with the compiled kv rules (gets created/updated if outdated).
+    :return:            tuple of the root widget of the kv file (or None), the duration of the parsing of the
+                        kv file (stored in the cache) and the duration of the load of the cache (0.0 if not used).
+    """
+    with open(kv_file, 'rb') as file_handle:
+        content = file_handle.read()
+    # kivy version for the pickled Parser internals, python bytecode version for the marshalled code objects
+    cache_key = (KV_CACHE_VERSION, kivy.__version__, sys.version_info[:2], MAGIC_NUMBER,
+                 hashlib.sha1(content).hexdigest())
+
+    start_time = perf_counter()
+    try:
+        with open(cache_file, 'rb') as file_handle:
+            old_key, parse_time, parser = pickle.load(file_handle)
+    except Exception:                   # missing, corrupted or incompatible cache file
+        old_key = parse_time = parser = None
+
+    if old_key == cache_key and hasattr(kv_builder, 'Parser') \
+            and all(hasattr(parser, attr) for attr in KV_PARSER_ATTRIBUTES):
+        try:
+            parser.execute_directives()     # imports/sets of the kv file are not cached
+            load_time = perf_counter() - start_time
+            ori_parser = kv_builder.Parser
+            kv_builder.Parser = lambda **_kwargs: parser    # let Builder merge the rules of the prepared parser
+            try:
+                return Builder.load_string("", filename=kv_file), parse_time, load_time
+            finally:
+                kv_builder.Parser = ori_parser
+        except Exception:               # incompatible cached rules: unload them for the fallback to the kv file
+            Builder.unload_file(kv_file)
+
+    kv_string = content.decode('utf-8')
+    start_time = perf_counter()
+    parser = Parser(content=kv_string, filename=kv_file)
+    parse_time = perf_counter() - start_time
+    try:
+        with open(cache_file, 'wb') as file_handle:
+            _KvPickler(file_handle, protocol=pickle.HIGHEST_PROTOCOL).dump((cache_key, parse_time, parser))
+    except (OSError, pickle.PicklingError):
+        pass
+
+    return Builder.load_string(kv_string, filename=kv_file), parse_time, 0.0
+
+
+def preload_atlas(atlas_path: str) -> bool:
+    """ load image atlas into the kivy atlas cache, so that all its images get displayed from one shared texture.
+
+    :param atlas_path:  path of the atlas file without the .atlas extension (like in the atlas:// image urls).
+    :return:            True if the atlas got loaded/uploaded, False if it was already cached.
+    """
+    if Cache.get('kv.atlas', atlas_path):
+        return False
+    Cache.append('kv.atlas', atlas_path, Atlas(atlas_path + '.atlas'))
+    return True
+
+
 class FrameworkApp(App):
     """ framework app class """
 
     landscape = BooleanProperty()           #: True if app window width is bigger than the app window height, else False
-    app_state = DictProperty()              #: duplicate of MainAppBase app state attributes for events/binds
+
+    _win_pos_size_trigger: Any = None       #: clock trigger coalescing the window geometry events to one per frame
 
     # kivy App class methods and callbacks
 
     def __init__(self, main_app: 'KivyMainApp', **kwargs):
         """ init kivy app """
         self.main_app = main_app
+        self.app_state: AppStateType = dict()               #: duplicate of MainAppBase app state attributes
         self.title = main_app.app_title                     #: set kivy.app.App.title
         self.icon = os.path.join("img", "app_icon.png")     #: set kivy.app.App.icon
 
         super().__init__(**kwargs)
 
+    def init_app_state(self, app_state: AppStateType):
+        """ create for each app state variable an observable kivy property with the same name.
+
+        :param app_state:   dict with the app state keys and values. The kv rules of the app can bind to a single
+                            app state variable (e.g. app.context_id), so that a change of it gets only dispatched
+                            to the rules depending on this app state variable. The properties of list/dict values
+                            are getting a copy, so that an in-place change gets detected on the next assignment.
+        """
+        for key, value in app_state.items():
+            if self.property(key, quiet=True) is None:
+                self.apply_property(**{key: ObjectProperty(None, allownone=True)})
+            setattr(self, key, value.copy() if isinstance(value, (dict, list)) else value)
+        self.app_state.update(app_state)
+
+    def load_kv(self, filename: Optional[str] = None) -> bool:
+        """ load kv file of the app from the cache of the compiled kv rules (if up-to-date). """
+        kv_file = resource_find(filename or self.kv_file or "")
+        if not kv_file:
+            return super().load_kv(filename=filename)
+
+        cache_file = os.path.join(self.user_data_dir, os.path.basename(kv_file) + KV_CACHE_EXT)
+        root, parse_time, load_time = load_kv_cached(kv_file, cache_file)
+        if root:
+            self.root = root
+
+        main_app = self.main_app
+        main_app.record_startup_phase('kv_load')
+        if load_time:
+            main_app.lazy_dpo("kv rules of {} loaded from cache in {:.1f}ms, saving {:.1f}ms of parsing",
+                              kv_file, load_time * 1000, (parse_time - load_time) * 1000)
+        else:
+            main_app.lazy_dpo("kv rules of {} parsed in {:.1f}ms and cached", kv_file, parse_time * 1000)
+        return True
+
     def build(self):
         """ build app """
         self.main_app.po('App.build(), user_data_dir', self.user_data_dir,
                          "config files", getattr(self.main_app, '_cfg_files'))
-        Window.bind(on_resize=self.win_pos_size_changed,
-                    left=self.win_pos_size_changed,
-                    top=self.win_pos_size_changed,
+        self._win_pos_size_trigger = Clock.create_trigger(self.win_pos_size_changed)
+        Window.bind(on_resize=self._win_pos_size_trigger,
+                    left=self._win_pos_size_trigger,
+                    top=self._win_pos_size_trigger,
                     on_key_down=self.on_key_down,
                     on_key_up=self.on_key_up)
 
+        for atlas_path in self.main_app.preload_atlases:
+            if preload_atlas(atlas_path):
+                self.main_app.lazy_dpo("image atlas {} preloaded", atlas_path)
+        self.main_app.record_startup_phase('atlas_preload')
+
         return Factory.MaioRoot()
 
     def on_key_down(self, keyboard, key_code, _scan_code, key_text, modifiers):
@@ -78,26 +214,41 @@ class FrameworkApp(App):
 
     def on_start(self):
         """ app start event """
-        self.win_pos_size_changed()  # init. app./self.landscape (on app startup and after build)
+        self.win_pos_size_changed(force=True)  # init. app./self.landscape (on app startup and after build)
         self.main_app.root_layout = self.root
         self.main_app.root_win = self.root.parent
+        self.main_app.record_startup_phase('build')
         self.main_app.call_event('on_app_start')
+        Window.bind(on_flip=self.on_first_flip)
+
+    def on_first_flip(self, *_):
+        """ one-time window flip event, fired after the first frame got displayed. """
+        Window.unbind(on_flip=self.on_first_flip)
+        self.main_app.on_first_frame()
 
     def on_pause(self):
         """ app pause event """
-        self.main_app.save_app_states()
+        self.main_app.save_app_states()     # waits for a save running in the background
         self.main_app.call_event('on_app_pause')
         return True
 
     def on_stop(self):
         """ quit app event """
-        self.main_app.save_app_states()
+        self.main_app.save_app_states()     # waits for a save running in the background
         self.main_app.call_event('on_app_stop')
 
-    def win_pos_size_changed(self, *_):
-        """ screen resize handler """
+    def win_pos_size_changed(self, *_, force: bool = False):
+        """ screen resize handler, called via _win_pos_size_trigger at most once per frame.
+
+        :param force:       pass True for to update the app state and fire the on_win_pos_size event also if the
+                            window position and size did not change.
+        """
+        landscape = self.root.width >= self.root.height
+        if landscape != self.landscape:
+            self.landscape = landscape
         win_pos_size = (Window.left, Window.top, Window.width, Window.height)
-        self.landscape = self.root.width >= self.root.height
+        if win_pos_size == self.main_app.win_rectangle and not force:
+            return
         self.main_app.po('win_pos_size_changed', self.landscape, *win_pos_size)
         self.main_app.change_app_state('win_rectangle', win_pos_size)
         self.main_app.call_event('on_win_pos_size')
@@ -106,9 +257,25 @@ class FrameworkApp(App):
 class KivyMainApp(MainAppBase):
     """ Kivy application """
     win_rectangle: tuple = (0, 0, 800, 600)                 #: window coordinates app state variable
+    async_mode: bool = False                                #: True for to run the app in an asyncio event loop
+    preload_atlases: Tuple[str, ...] = ()                   #: atlas paths loaded into the texture cache on build
+
+    _tasks: Set[asyncio.Future]                             #: pending background tasks (only used in async mode)
+    _save_task: Optional[asyncio.Future] = None             #: pending save_app_states task
+    _save_again: bool = False                               #: True if app states changed while _save_task is pending
+
+    _changed_app_states: Dict[str, Any]                     #: app state values to dispatch to their kivy properties
+    _app_states_trigger: Any = None                         #: clock trigger dispatching the app states once per frame
+
+    _bubble_messages: Deque[Tuple[Any, ...]]                #: ring buffer of the latest debug bubble messages
+    _bubble_render_trigger: Any = None                      #: clock trigger rate-limiting the debug bubble rendering
+    _bubble_remove_trigger: Any = None                      #: clock trigger removing the debug bubble
 
     def on_app_init(self):
         """ initialize framework app instance """
+        self._tasks = set()
+        self._changed_app_states = dict()
+        self._bubble_messages = deque(maxlen=BUBBLE_MESSAGES)
         win_rect = self.win_rectangle
         if win_rect:
             Window.left, Window.top = win_rect[:2]
@@ -117,23 +284,138 @@ class KivyMainApp(MainAppBase):
         self.framework_app = FrameworkApp(self)
         self.framework_app.kv_file = 'main.kv'
 
-        self.framework_app.app_state.update(self.retrieve_app_states())  # copy app states to duplicate DictProperty
+        self.framework_app.init_app_state(self.retrieve_app_states())   # copy app states to duplicate properties
 
     def run_app(self):
         """ startup/display the application """
-        if self.debug_bubble:
-            Builder.load_string(DEBUG_BUBBLE_DEF)
+        self.framework_app.init_app_state(self.retrieve_app_states())
+
+        if self.async_mode:
+            asyncio.run(self.async_run_app())
+        else:
+            self.framework_app.run()
+
+    async def async_run_app(self):
+        """ run the kivy app loop within the asyncio event loop, together with the background tasks. """
+        try:
+            await self.framework_app.async_run(async_lib='asyncio')
+        finally:
+            self.cancel_tasks()
+
+    def cancel_tasks(self):
+        """ cancel all pending background tasks (a task already running in the executor thread will be finished). """
+        for task in list(self._tasks):
+            task.cancel()
+        self._tasks.clear()
+        self._save_task = None
+        self._save_again = False
+
+    def run_in_background(self, func: Callable, *args) -> Optional[asyncio.Future]:
+        """ run blocking callable as awaitable task in the default executor of the running asyncio event loop.
+
+        :param func:        callable to run (e.g. doing file I/O).
+        :param args:        positional arguments passed to the callable.
+        :return:            awaitable future of the task or None if not in async mode (then func got called directly).
+        """
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:    # not running in async mode
+            func(*args)
+            return None
+        task = loop.run_in_executor(None, func, *args)
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return task
+
+    def save_app_states_task(self) -> Optional[asyncio.Future]:
+        """ save the app states in a background task, coalescing the save requests done while a save is pending.
 
-        self.framework_app.app_state = self.retrieve_app_states()
+        The app state values get frozen in the current (kivy) thread and only the file I/O is done in the background.
 
-        self.framework_app.run()
+        :return:            awaitable future of the save task or None if not in async mode (then saved directly).
+        """
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:    # not running in async mode
+            self.save_app_states()
+            return None
+
+        if self._save_task:
+            self._save_again = True
+        else:
+            self._save_task = self.run_in_background(self.write_app_states, self.prepare_app_states_save())
+            self._save_task.add_done_callback(self._save_task_done)
+        return self._save_task
+
+    def _save_task_done(self, task: asyncio.Future):
+        """ save task done callback for to start another save if the app states changed in the meantime. """
+        if task is not self._save_task:
+            return              # got cancelled
+        self._save_task = None
+        try:
+            err_msg = task.result()
+        except Exception as ex:     # exception raised in the executor thread by write_app_states
+            err_msg = f"KivyMainApp._save_task_done: writing of app states failed with exception {ex!r}"
+        self.app_states_saved(err_msg)
+        if self._save_again:
+            self._save_again = False
+            self.save_app_states_task()
+
+    def change_app_states(self, **app_states: Any):
+        """ change app state items and dispatch the changed values of a frame together to their kivy properties. """
+        super().change_app_states(**app_states)
+        framework_app = self.framework_app
+        if framework_app:
+            changed = self._changed_app_states
+            for state_name, new_value in app_states.items():
+                if framework_app.property(state_name, quiet=True) is not None:  # app states with a kivy property
+                    changed[state_name] = new_value.copy() if isinstance(new_value, (dict, list)) else new_value
+            if changed:
+                if not self._app_states_trigger:
+                    self._app_states_trigger = Clock.create_trigger(self.dispatch_app_states)
+                self._app_states_trigger()
+
+    def dispatch_app_states(self, *_):
+        """ dispatch the app state changes of the current frame to their kivy properties (called via clock trigger).
+
+        All app state changes of a frame (e.g. of several change_app_state calls) get dispatched together, and each
+        property gets set only once with the latest value. A property does not dispatch an unchanged value (compared
+        to the copy of a list/dict value), so that the kv rules bound to it are only evaluated on real changes.
+        """
+        changed, self._changed_app_states = self._changed_app_states, dict()
+        for state_name, new_value in changed.items():
+            setattr(self.framework_app, state_name, new_value)
 
     def show_bubble(self, *objects, file: Optional[TextIO] = None, **kwargs):
         """ show popup bubble - compatible to Python print() and AppBase.print_out() """
+        self._bubble_messages.append(objects)
+        if not self._bubble_render_trigger:
+            self._bubble_render_trigger = Clock.create_trigger(self._render_bubble, BUBBLE_RENDER_INTERVAL)
+            self._bubble_remove_trigger = Clock.create_trigger(self._remove_bubble, BUBBLE_SHOW_TIME)
+        self._bubble_render_trigger()   # render at most once per BUBBLE_RENDER_INTERVAL
+        self.po(*objects, file=file, **kwargs)
+
+    def _render_bubble(self, *_):
+        """ display the latest buffered messages in the debug bubble and (re-)start its removal timer. """
         if not self.info_bubble:
+            Builder.load_string(DEBUG_BUBBLE_DEF)   # deferred kv parsing (not needed for the first frame)
             self.info_bubble = Factory.DebugBubble()
-        self.info_bubble.message = " ".join([repr(message) for message in objects])
+        self.info_bubble.message = "\n".join(" ".join(message if isinstance(message, str) else repr(message)
+                                                      for message in objects)
+                                             for objects in self._bubble_messages)
         if not self.info_bubble.parent:  # Check if bubble is not already on screen
             Window.add_widget(self.info_bubble)
-        Clock.schedule_once(lambda dt: Window.remove_widget(self.info_bubble), 9)  # Remove bubble after some seconds
-        self.po(*objects, file=file, **kwargs)
+        self._bubble_remove_trigger.cancel()
+        self._bubble_remove_trigger()
+
+    def _remove_bubble(self, *_):
+        """ remove the debug bubble and clear the buffered messages. """
+        Window.remove_widget(self.info_bubble)
+        self._bubble_messages.clear()
+
+    def show_timings(self, file_path: str = "") -> str:
+        """ display the statistics of the timed hot paths in the debug bubble (if enabled). """
+        if self.debug_bubble:
+            self.show_bubble(self.startup_report(), self.timings.report())
+            return self.timings.dump(file_path, prefix=self.startup_report()) if file_path else ""
+        return super().show_timings(file_path=file_path)
@@ -41,9 +41,10 @@ app instances if you want to update ony :ref:`config-variables`, like
 import os
 import glob
 import shutil
-from typing import List
+from importlib.machinery import PathFinder
+from importlib.util import module_from_spec
+from typing import Callable, List, Optional, Tuple
 
-from ae.core import module_callable         # type: ignore
 from ae.console import get_user_data_path   # type: ignore
 
 
@@ -107,6 +108,24 @@ def check_local_overwrites(src_folder: str = OVERWRITES_SRC_FOLDER_NAME, dst_fol
     return _move_files(src_folder, dst_folder, overwrite=True)
 
 
+def _find_run_updater(module_name: str) -> Tuple[str, Optional[Callable]]:
+    """ find module in the current working directory and determine its run_updater function.
+
+    :param module_name:     name of the module (can also be deployed only as byte-compiled .pyc file).
+    :return:                tuple of the file path of the module and its run_updater function or of an empty
+                            string and None if the module does not exist in the current working directory.
+    """
+    if not os.path.exists(module_name + ".py") and not os.path.exists(module_name + ".pyc"):
+        return "", None                                 # skip the import machinery if there is nothing to run
+    cwd = os.getcwd()
+    spec = PathFinder.find_spec(module_name, [cwd])
+    if spec is None or spec.loader is None or not spec.origin or os.path.dirname(spec.origin) != cwd:
+        return "", None
+    module = module_from_spec(spec)
+    spec.loader.exec_module(module)     # type: ignore
+    return spec.origin, getattr(module, 'run_updater', None)
+
+
 def check_local_updates() -> bool:
     """ check if ae_updater script exists in the current working directory for to be executed and deleted.
 
@@ -117,10 +136,10 @@ def check_local_updates() -> bool:
 
     :return:                return value (True) of executed run_updater method (if module&function exists), else False.
     """
-    _, func = module_callable(UPDATER_MODULE_NAME + ':run_updater')
+    module_file, func = _find_run_updater(UPDATER_MODULE_NAME)
     ret = func() if func else False
     if ret:
-        os.remove(UPDATER_MODULE_NAME + ".py")
+        os.remove(module_file)
     return ret
 
 
@@ -129,7 +148,7 @@ def check_local_bootstraps() -> bool:
 
     :return:                return value (True) of executed run_updater function (if module&function exists) else False.
     """
-    _, func = module_callable(BOOTSTRAP_MODULE_NAME + ':run_updater')
+    _, func = _find_run_updater(BOOTSTRAP_MODULE_NAME)
     return func() if func else False
 
 
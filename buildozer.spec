@@ -32,7 +32,7 @@ source.exclude_dirs = tests,bin,htmlcov,mypy_report
 
 # (list) List of exclusions using pattern matching
 #source.exclude_patterns = license,images/*/*.jpg
-source.exclude_patterns = __pycache__/**,**/__pycache__/**
+source.exclude_patterns = __pycache__/**,**/__pycache__/**,img/72/*
 
 # (str) Application versioning (method 1)
 #version = 0.1
@@ -18,45 +18,84 @@
     0.13    finished unit tests for gui_app portion.
     0.14-20 extended kivy_app portion and unit tests, added icon images and bug fixing.
     0-21-22 added ae.updater and small UI bug fixes.
+  icons atlas:
+    the icons in img/72 get packed into one texture atlas (img/icons72.atlas and img/icons72-0.png), referenced
+    via atlas://img/icons72/<icon_name> urls. After adding/changing an icon in img/72 regenerate the atlas with:
+    python -m kivy.atlas img/icons72 256x256 img/72/*.png
   ToDo:
     - user specific app theme (color, fonts) config screen
 
 """
-from typing import Any, Dict, List, Optional
+import threading
+from bisect import bisect_right
+from collections import OrderedDict
+from itertools import islice
+from typing import Any, Dict, List, Optional, Tuple
 
 from kivy.animation import Animation
 from kivy.app import App
+from kivy.clock import Clock
 from kivy.factory import Factory
+from kivy.graphics import (ClearBuffers, ClearColor, Color, Fbo, InstructionGroup, Line, Mesh, Rectangle,
+                           RoundedRectangle, Translate)
+from kivy.metrics import sp
+from kivy.properties import BooleanProperty, ObjectProperty
 from kivy.uix.boxlayout import BoxLayout
 from kivy.uix.image import Image
-from kivy.uix.popup import Popup
 from kivy.uix.widget import Widget
 from kivy.core.window import Window
 
+from ae.gui_app import APP_STATE_SECTION_NAME
 from ae.kivy_app import KivyMainApp
 
+from maio_data import ItemDataType, ListDataType, MaioDataMixin, delete_confirm_title
+
 
 __version__ = '0.23'
 
 
-ItemDataType = Dict[str, Any]
-ListDataType = List[ItemDataType]
+ListViewType = Tuple[int, List[Widget], Dict[str, Widget], float, float]  #: cached list view (see on_context_draw)
+
+ITEM_CANVAS_GROUP = 'itemCanvas'    #: group name of the ListItem canvas instructions replaced by the batched rendering
+
+MESH_MAX_QUADS = 65535 // 4        #: maximum number of quads per batched mesh (vertex indices are unsigned shorts)
+
+DELETE_PREVIEW_NAMES = 6            #: maximum number of item names displayed in the delete confirmation popup
+
+#: navigation key names and the number of displayed list items the context item gets moved by them
+NAVIGATION_KEYS = {'up': -1, 'down': 1, 'pgup': -15, 'pgdown': 15, 'home': -999999, 'end': 999999}
 
 
-class MaioApp(KivyMainApp):
+class MaioApp(MaioDataMixin, KivyMainApp):
     """ app class """
     selected_item_ink: tuple = (0.69, 1.0, 0.39, 0.18)      #: rgba color tuple for list items (selected)
     unselected_item_ink: tuple = (0.39, 0.39, 0.39, 0.18)   #: rgba color tuple for list items (unselected)
-    context_path_ink: tuple = (0.99, 0.99, 0.39, 0.48)      #: rgba color tuple for drag&drop item placeholder
-    context_id_ink: tuple = (0.99, 0.99, 0.69, 0.69)        #: rgba color tuple for drag&drop sub_list placeholder
+    context_path_ink: tuple = (0.99, 0.99, 0.39, 0.48)      #: rgba color tuple for drag&drop item drop indicator
+    context_id_ink: tuple = (0.99, 0.99, 0.69, 0.69)        #: rgba color tuple for drag&drop sub_list drop indicator
     filter_selected: bool = True                            #: True for to hide selected items
     filter_unselected: bool = True                          #: True for to hide unselected items
-    data_tree: ListDataType = list()                        #: app data
+    batched_item_canvas: bool = False                       #: True for to draw all list item backgrounds in one batch
+    multi_drag: bool = False                                #: True for to drag&drop all selected items together
+    app_state_snapshot: bool = True                         #: cache decoded app states in a binary snapshot file
+    async_mode: bool = True                                 #: run app in asyncio loop, saving app states in background
+    preload_atlases: Tuple[str, ...] = ('img/icons72', )    #: icons atlas, shared by all list items and buttons
 
-    current_list: ListDataType = list()             #: item data of currently displayed sub-list
     dragging_list_idx: Optional[int] = None         #: index of dragged data in current list if in drag mode else None
-    placeholders_above: Dict[int, Widget] = dict()  #: added placeholder above widgets (used for drag+drop)
-    placeholders_below: Dict[int, Widget] = dict()  #: added placeholder below widgets (used for drag+drop)
+    drop_slot: Optional[Tuple[int, str]] = None     #: list index and part (above/below/into) of drag&drop target
+    item_widgets: Dict[str, Widget] = dict()        #: displayed ListItem widgets of the current list, keyed by id
+    highlighted_widget: Optional[Widget] = None     #: ListItem widget currently highlighted as context item
+
+    list_view_cache: Dict[Tuple[str, ...], ListViewType] = OrderedDict()  #: LRU cache of list views by context path
+    list_view_cache_size: int = 9                   #: maximum number of list views kept in list_view_cache
+    _drawn_path: Optional[Tuple[str, ...]] = None   #: context path of the currently displayed list view
+    _drawn_version: int = -1                        #: data_version at the time the displayed list view got drawn
+
+    _nav_delta: int = 0                             #: accumulated navigation delta of the key presses of this frame
+    _nav_released: bool = False                     #: True if a navigation key got released (for to save context)
+    _nav_trigger: Any = None                        #: clock trigger coalescing the navigation key presses per frame
+    _nav_key: Optional[Tuple[Any, ...]] = None      #: drawn path/version/item count of the navigation index
+    _nav_names: List[str] = list()                  #: names of the displayed list items in display order
+    _nav_indexes: Dict[str, int] = dict()           #: display index of the displayed list items, keyed by name
 
     _current_widget: Optional[Widget]               #: widget used for to add a new or edit a list item
 
@@ -68,19 +107,38 @@ class MaioApp(KivyMainApp):
         sub_list, self.current_list = self.get_context_list()
         self.dpo("on_context_draw", sub_list or 'RooT', context_id)
 
-        lf_ds = self.root_layout.ids.menuBar.ids.listFilterSelected.state == 'normal'
-        lf_ns = self.root_layout.ids.menuBar.ids.listFilterUnselected.state == 'normal'
         lcw = self.root_layout.ids.listContainer
+        context_path = tuple(self.context_path)
+        list_view = None
+        if context_path != self._drawn_path:    # user navigated into another list, else refresh
+            self.cache_list_view()
+            list_view = self.list_view_cache.pop(context_path, None)
+        self.highlight_context_item('')
         lcw.clear_widgets()
-        h = 0
-        for list_idx, lid in enumerate(self.current_list):
-            if list_idx != self.dragging_list_idx:
-                sel_state = lid.get('sel')
-                if lf_ds and sel_state or lf_ns and not sel_state:
-                    for liw in self.create_item_widgets(list_idx, lid):
-                        lcw.add_widget(liw)
-                        h += liw.height
-        lcw.height = h
+        self.item_widgets.clear()
+
+        if list_view and list_view[0] == self.data_version:
+            _, widgets, item_widgets, h, scroll_y = list_view
+            self.dpo("on_context_draw: reusing cached list view", context_path)
+            for liw in widgets:
+                lcw.add_widget(liw)
+            self.item_widgets.update(item_widgets)
+            lcw.height = h
+            lcw.parent.scroll_y = scroll_y
+        else:
+            lf_ds = self.root_layout.ids.menuBar.ids.listFilterSelected.state == 'normal'
+            lf_ns = self.root_layout.ids.menuBar.ids.listFilterUnselected.state == 'normal'
+            h = 0
+            for list_idx, lid in enumerate(self.current_list):
+                if list_idx != self.dragging_list_idx:
+                    sel_state = lid.get('sel')
+                    if lf_ds and sel_state or lf_ns and not sel_state:
+                        for liw in self.create_item_widgets(list_idx, lid):
+                            lcw.add_widget(liw)
+                            h += liw.height
+            lcw.height = h
+        self._drawn_path = context_path
+        self._drawn_version = self.data_version
 
         # ensure that current leaf/sub-list is visible - if still exists in current list
         redraw = False
@@ -95,34 +153,37 @@ class MaioApp(KivyMainApp):
         # restore self.context_id (changed in list redraw by setting observed selectButton.state)
         self.set_context(context_id, redraw=redraw)
         # save changed app states (because context/content got changed by user)
-        self.save_app_states()
+        self.save_app_states_task()
+
+    def load_app_states(self):
+        """ overwritten for to add the multi_drag app state variable to config files created by older app versions.
+
+        The kv rule of the multi-drag toggle button binds to the kivy property of this app state, which gets only
+        created for the app state variables existing in the config files.
+        """
+        super().load_app_states()
+        if 'multi_drag' not in self.state_store.keys:   # user data config file doesn't get overwritten by the updater
+            self.set_var('multi_drag', self.multi_drag, section=APP_STATE_SECTION_NAME)
+            self.load_cfg_files()
+            self.state_store.load_keys(self._cfg_parser)
 
     def on_app_start(self):
         """ callback after app init/build for to draw/refresh gui. """
         self.on_context_draw()
 
-    def on_key_press(self, key_code, _modifiers):
+    def on_key_press(self, key_code, modifiers):
         """ check key press event and maybe process command/action. """
         pop_up_open = len(self.root_win.children) > 1
         # current item context changes
-        if key_code == 'up':
-            self.set_neighbour_context(-1)
-        elif key_code == 'down':
-            self.set_neighbour_context(1)
-        elif key_code == 'pgup':
-            self.set_neighbour_context(-15)
-        elif key_code == 'pgdown':
-            self.set_neighbour_context(15)
-        elif key_code == 'home':
-            self.set_neighbour_context(-999999)
-        elif key_code == 'end':
-            self.set_neighbour_context(999999)
+        if key_code in NAVIGATION_KEYS:
+            self.navigate_context(NAVIGATION_KEYS[key_code])
 
         # toggle selection of current item
         elif key_code == ' ' and self.context_id:    # key string 'space' is not in Window.command_keys
             liw = self.get_widget_by_name(self.context_id)
             new_state = 'normal' if liw.ids.toggleSelected.state == 'down' else 'down'
             self.update_item_data(liw, self.context_id, new_state)
+            self.item_selection_toggled()
             self.on_context_draw()
 
         # enter/leave context (current list or popup window)
@@ -132,7 +193,7 @@ class MaioApp(KivyMainApp):
         elif key_code in ('enter', 'right') and self.context_id \
                 and 'sub_list' in self.get_widget_by_name(self.context_id).item_data:
             self.context_enter(self.context_id)
-        elif key_code in ('escape', 'left') and self.framework_app.app_state['context_path']:
+        elif key_code in ('escape', 'left') and self.context_path:
             self.context_leave()
 
         # item processing: add, request confirmation of deletion of current item
@@ -142,91 +203,135 @@ class MaioApp(KivyMainApp):
         elif key_code in ('-', 'del') and not pop_up_open and self.context_id:
             self.delete_item_popup(self.context_id)
 
+        # toggle drag&drop of all selected items together
+        elif key_code == 'm' and 'ctrl' in modifiers:
+            self.toggle_multi_drag()
+
+        # show/dump the hot path timings (only recorded if app got started with debugLevel 3)
+        elif key_code == 't' and 'ctrl' in modifiers and self.timings.enabled:
+            self.show_timings(file_path=f"{self.app_name}_timings.txt")
+
         else:
             return False    # pressed key not processable in the current context/app-state
 
         return True         # key press processed
 
+    def on_key_release(self, key_code):
+        """ persist the context, changed by holding down a navigation key, once the key got released. """
+        if key_code in NAVIGATION_KEYS:
+            self._nav_released = True
+            self.navigate_context(0)
+            return True
+        return False
+
+    def toggle_multi_drag(self):
+        """ toggle multi-drag mode (drag&drop of all selected items together). """
+        self.change_app_state('multi_drag', not self.multi_drag)
+        self.save_app_states_task()
+
     # item/widget context handling and search in currently displayed list
 
+    def cache_list_view(self):
+        """ put widgets and scroll position of the displayed list view into the LRU cache of the list views. """
+        if self._drawn_path is None:
+            return
+        lcw = self.root_layout.ids.listContainer
+        self.highlight_context_item('')
+        self.list_view_cache[self._drawn_path] = (self._drawn_version, list(reversed(lcw.children)),
+                                                  self.item_widgets.copy(), lcw.height, lcw.parent.scroll_y)
+        while len(self.list_view_cache) > self.list_view_cache_size:
+            self.list_view_cache.popitem(last=False)
+
+    def change_app_states(self, **app_states: Any):
+        """ overwritten for to move the context highlight without re-evaluating the canvas of all list items. """
+        super().change_app_states(**app_states)
+        if 'context_id' in app_states:
+            self.highlight_context_item(app_states['context_id'])
+        if not app_states.keys().isdisjoint(('filter_selected', 'filter_unselected', 'font_size')):
+            self.data_version += 1      # invalidate cached list views
+
+    def animate_context_transition(self, direction: int):
+        """ slide a snapshot of the currently displayed list out, while the new list gets laid out behind it.
+
+        :param direction:   -1 for to slide the snapshot out to the left, 1 for to slide it out to the right.
+        """
+        svw = self.root_layout.ids.listContainer.parent
+        win_pos = svw.parent.to_window(*svw.pos, initial=False)    # svw.pos is in the local coordinates of its parent
+        snapshot = Factory.ContextSnapshot(texture=snapshot_texture(svw), pos=win_pos, size=svw.size)
+        Window.add_widget(snapshot)
+        ani = Animation(x=snapshot.x + direction * snapshot.width, opacity=0.3, d=0.21, t='out_quint')
+        ani.bind(on_complete=lambda *_: Window.remove_widget(snapshot))
+        ani.start(snapshot)
+
     def context_enter(self, context_id: str, next_context_id: str = ''):
         """ overwrite to animate. """
-        lcw = self.root_layout.ids.listContainer
-        ani = Animation(x=Window.width, d=0.003) + Animation(x=lcw.x, d=0.21, t='out_quint')
-        ani.start(lcw)
+        self.animate_context_transition(-1)
         super().context_enter(context_id, next_context_id=next_context_id)
 
     def context_leave(self, next_context_id: str = ''):
         """ overwrite to animate. """
-        lcw = self.root_layout.ids.listContainer
-        ani = Animation(y=100, right=100, d=0.006) + Animation(y=lcw.y, right=lcw.right, d=0.21, t='out_quint')
-        ani.start(lcw)
+        self.animate_context_transition(1)
         super().context_leave(next_context_id=next_context_id)
 
-    def find_item_index(self, item_name: str, searched_list: Optional[ListDataType] = None) -> int:
-        """ determine list index in the currently displayed list. """
-        if searched_list is None:
-            searched_list = self.current_list
-        for list_idx, data in enumerate(searched_list):
-            if data['id'] == item_name:
-                return list_idx
-        return -1
-
-    def get_context_list(self, path_end_idx: Optional[int] = None):
-        """ get list name and data of the current context list. """
-        current_list = self.data_tree
-        sub_list_name = ''
-        for sub_list_name in self.context_path[:path_end_idx]:
-            current_list = self.get_item_by_name(sub_list_name, searched_list=current_list)['sub_list']
-        return sub_list_name, current_list
-
-    def get_item_by_name(self, item_name: str, searched_list: Optional[ListDataType] = None) -> ItemDataType:
-        """ search list item in current list """
-        if searched_list is None:
-            searched_list = self.current_list
-        lx = self.find_item_index(item_name, searched_list=searched_list)
-        if lx != -1:
-            return searched_list[lx]
-        return dict(id='')
-
     def get_widget_by_name(self, item_name: str) -> Optional[Widget]:
         """ search list item widget """
+        liw = self.item_widgets.get(item_name)
+        if liw and liw.parent is self.root_layout.ids.listContainer:
+            return liw
+        return None
+
+    def highlight_context_item(self, item_name: str):
+        """ move context item highlight, touching only the previously and the newly highlighted widget. """
+        liw = self.item_widgets.get(item_name)
+        old_liw = self.highlighted_widget
+        if liw is not old_liw:
+            if old_liw:
+                old_liw.is_context = False
+            if liw:
+                liw.is_context = True
+            self.highlighted_widget = liw
+
+    def navigate_context(self, delta: int):
+        """ move context id by delta items, coalescing the key press events (and auto-repeats) to one move per frame.
+
+        :param delta:       number of displayed items to move the context item down (or up if negative).
+        """
+        self._nav_delta += delta
+        if not self._nav_trigger:
+            self._nav_trigger = Clock.create_trigger(self._navigate)
+        self._nav_trigger()
+
+    def _navigate(self, *_):
+        """ apply the accumulated navigation delta and save the app states if the navigation key got released. """
+        delta, self._nav_delta = self._nav_delta, 0
+        if delta:
+            self.set_neighbour_context(delta)
+        if self._nav_released:
+            self._nav_released = False
+            self.save_app_states_task()
+
+    def set_neighbour_context(self, delta: int):
+        """ move context id to previous/next displayed item, only moving the highlight and the scroll position.
+
+        :param delta:       number of displayed items to move the context item down (or up if negative).
+        """
         lcw = self.root_layout.ids.listContainer
-        for liw in lcw.children:
-            item_data = getattr(liw, 'item_data', None)
-            if item_data and item_data['id'] == item_name:
-                return liw
-
-    def set_neighbour_context(self, delta):
-        """ move context id to previous/next item. """
-        current_list = self.current_list
-        if current_list:
-            context_id = self.context_id
-            if context_id:
-                idx = min(max(0, self.find_item_index(context_id) + delta), len(current_list) - 1)
-            else:
+        nav_key = (self._drawn_path, self._drawn_version, len(self.item_widgets))
+        if nav_key != self._nav_key:   # displayed list changed: re-index the names of the displayed items
+            self._nav_names = [name for name, liw in self.item_widgets.items() if liw.parent is lcw]
+            self._nav_indexes = {name: idx for idx, name in enumerate(self._nav_names)}
+            self._nav_key = nav_key
+        names = self._nav_names
+        if names:
+            idx = self._nav_indexes.get(self.context_id)
+            if idx is None:
                 idx = min(max(-1, delta), 0)
-            self.set_context(current_list[idx]['id'])
-
-    def sub_item_names(self, item_name, sub_list_only, sub_list=None, sub_item_names=None):
-        """ return item names of item, including sub_list items (if exists). """
-        if sub_list is None:
-            sub_list = self.current_list
-        if sub_item_names is None:
-            sub_item_names = list()
-
-        if not sub_list_only:
-            sub_item_names.append(item_name)
-
-        item_data = self.get_item_by_name(item_name, sub_list)
-        sub_list = item_data.get('sub_list', list())
-        for sub_item in sub_list:
-            if sub_item.get('sub_list'):
-                self.sub_item_names(sub_item['id'], False, sub_list, sub_item_names)
             else:
-                sub_item_names.append(sub_item['id'])
-
-        return sub_item_names
+                idx = min(max(0, idx + delta), len(names) - 1)
+            context_id = names[idx]
+            if context_id != self.context_id:
+                self.set_context(context_id, redraw=False)
+                lcw.parent.scroll_to(self.item_widgets[context_id], animate=False)
 
     # item (leaf/sub_list) add/delete/edit of name/copy/del
 
@@ -239,6 +344,7 @@ class MaioApp(KivyMainApp):
 
     def add_item_confirmed(self, item_name: str, liw: Widget, has_sub_list: bool):
         """ finish the addition of a new list item """
+        self.data_version += 1
         liw.item_data['id'] = item_name
         if has_sub_list:
             liw.item_data['sub_list'] = list()
@@ -247,68 +353,47 @@ class MaioApp(KivyMainApp):
         lcw = self.root_layout.ids.listContainer
         lcw.add_widget(liw)
         lcw.height += liw.height
+        self.item_widgets[item_name] = liw
 
         self.set_context(item_name)
 
-    def create_placeholder(self, child_idx: int, liw: Widget, touch_y: float) -> bool:
-        """ create placeholder data structures. """
-        child_idx -= self.cleanup_placeholder(child_idx=child_idx)
+    def create_placeholder(self, liw: Widget, touch_y: float) -> bool:
+        """ determine drop slot and show drop indicator (skipped if the drop slot did not change). """
         part = (touch_y - liw.y) / liw.height
         list_idx = liw.list_idx
-        self.dpo(f"create placeholder {child_idx:2} {list_idx:2} {liw.item_data['id'][:9]:9}"
-                 f" {liw.y:4.2f} {touch_y:4.2f} {part:4.2f}")
         if 'sub_list' in liw.item_data and 0.123 < part < 0.9:
-            self.placeholders_above[list_idx] = Factory.DropPlaceholder(height=liw.height / 2.7)
-            self.placeholders_below[list_idx] = Factory.DropPlaceholder(height=liw.height / 2.7)
+            drop_slot = (list_idx, 'into')
         elif -0.111 < part < 1.11:
-            placeholders = self.placeholders_above if part >= 0.501 else self.placeholders_below
-            placeholders[list_idx] = Factory.DropPlaceholder(dark=True, height=liw.height * 1.11)
+            drop_slot = (list_idx, 'above' if part >= 0.501 else 'below')
         else:
+            self.cleanup_placeholder()
             return False
+        if drop_slot == self.drop_slot:
+            return True                 # drop indicator of this drop slot is already displayed
 
-        # add widgets without redrawing (self.on_context_draw())
-        lcw = self.root_layout.ids.listContainer
-        for phw in self.placeholders_below.values():
-            lcw.add_widget(phw, index=child_idx)
-            lcw.height += phw.height
-            child_idx += 1
-        for phw in self.placeholders_above.values():
-            lcw.add_widget(phw, index=child_idx + 1)
-            lcw.height += phw.height
+        self.lazy_dpo("create placeholder {:2} {:5} {:9} {:4.2f} {:4.2f} {:4.2f}",
+                      list_idx, drop_slot[1], liw.item_data['id'][:9], liw.y, touch_y, part)
+        self.drop_slot = drop_slot
+        # reposition drop indicator without adding/removing widgets and without redrawing (self.on_context_draw())
+        self.root_layout.ids.listContainer.show_drop_indicator(liw, drop_slot[1])
 
         return True
 
-    def cleanup_placeholder(self, child_idx=0):
-        """ cleanup placeholder data and widgets. """
-        delta_idx = 0
-        placeholders = list(self.placeholders_above.values()) + list(self.placeholders_below.values())
-        for placeholder in placeholders:
-            lcw = placeholder.parent
-            if lcw:
-                del_idx = lcw.children.index(placeholder)
-                if del_idx < child_idx:
-                    delta_idx = 1
-                lcw.remove_widget(placeholder)
-                lcw.height -= placeholder.height
-
-        self.placeholders_above.clear()
-        self.placeholders_below.clear()
-
-        return delta_idx
+    def cleanup_placeholder(self):
+        """ cleanup drop slot and hide drop indicator. """
+        if self.drop_slot:
+            self.root_layout.ids.listContainer.show_drop_indicator(None, '')
+            self.drop_slot = None
 
     def create_item_widgets(self, list_idx: int, lid: ItemDataType) -> List[Widget]:
-        """ create widgets for to display one item, optionally with placeholder markers
+        """ create widgets for to display one item
 
         :param list_idx:    index of item_data within current list.
         :param lid:         list item data.
-        :return:            list of created widgets: one ListItem widget with item_data from lid and
-                            optional placeholders above/below.
+        :return:            list of created widgets: one ListItem widget with item_data from lid.
         """
         widgets = list()
 
-        if list_idx in self.placeholders_above:
-            widgets.append(self.placeholders_above[list_idx])
-
         # original item data dict passed to ListItem.__init__ will be reset by kv rules of the new widget
         # .. also toggleButton state will not be set correctly if assigning only item data with: liw.item_data = lid
         ori_lid = lid.copy()
@@ -316,27 +401,44 @@ class MaioApp(KivyMainApp):
         liw.ids.toggleSelected.text = ori_lid['id']
         liw.ids.toggleSelected.state = 'down' if ori_lid.get('sel') else 'normal'
         widgets.append(liw)
+        self.item_widgets[ori_lid['id']] = liw
         assert liw.item_data is lid
         assert liw.list_idx == list_idx
 
-        if list_idx in self.placeholders_below:
-            widgets.append(self.placeholders_below[list_idx])
-
         return widgets
 
     def delete_item_popup(self, item_name, sub_list_only=False):
         """ delete list """
-        if sub_list_only and not self.sub_item_names(item_name, sub_list_only=sub_list_only):
+        sub_items = self.iter_sub_items(item_name, sub_list_only)
+        preview = [name for _, name in islice(sub_items, DELETE_PREVIEW_NAMES + 1)]
+        if sub_list_only and not preview:
             self.delete_item_confirmed(item_name, del_sub_list=True)    # no confirm needed for del of empty sub list
             self.set_context(item_name)
         else:
             pu = Factory.ConfirmItemDeletePopup()
             pu.which_item = item_name
             pu.sub_list_only = sub_list_only
+            if len(preview) > DELETE_PREVIEW_NAMES:     # count the items of big sub-lists in the background
+                preview.pop()
+                pu.title = delete_confirm_title(preview)
+                cancel = threading.Event()
+                pu.bind(on_dismiss=lambda *_: cancel.set())
+                self.run_in_background(self._count_deleted_items, pu, preview, self.current_list, cancel)
+            else:
+                pu.title = delete_confirm_title(preview, [len(preview)])
             pu.open()
 
+    def _count_deleted_items(self, pu: Widget, preview: List[str], searched_list: ListDataType,
+                             cancel: threading.Event):
+        """ count the items to delete (running in a background thread) and display the counts in the popup title. """
+        counts = self.count_sub_items(pu.which_item, pu.sub_list_only, searched_list=searched_list,
+                                      is_cancelled=cancel.is_set)
+        if counts is not None:
+            Clock.schedule_once(lambda _dt: setattr(pu, 'title', delete_confirm_title(preview, counts)))
+
     def delete_item_confirmed(self, item_name, del_sub_list=False):
         """ delete item or sub-list of this item """
+        self.data_version += 1
         lcw = self.root_layout.ids.listContainer
         liw = self.get_widget_by_name(item_name)
         lid = self.get_item_by_name(item_name)
@@ -360,6 +462,7 @@ class MaioApp(KivyMainApp):
         svw = lcw.parent
         svw.scroll_to(liw)
         pos = svw.parent.to_widget(*liw.to_window(*liw.pos))    # - (lcw.size[1] - svw.size[1]) * svw.scroll_y
+        from kivy.uix.popup import Popup     # deferred import: not needed for to display the first frame
         border = Popup.border.defaultvalue   # (bottom, right, top, left)
         phx = pos[0] - border[3]
         phy = pos[1] - border[0]
@@ -416,10 +519,12 @@ class MaioApp(KivyMainApp):
                 return
             old_item_data['sub_list'] = list()
         old_item_data['id'] = new_name  # binding does set also: liw.text = text
+        self.data_version += 1
         self.set_context(new_name)
 
     def pop_ups_opened(self):
         """ determine tuple of all opened PopUp instances. """
+        from kivy.uix.popup import Popup     # deferred import: not needed for to display the first frame
         for wid in self.root_win.children:     # PopUps are attached to the (SDL) Window instance
             if isinstance(wid, Popup):
                 yield wid
@@ -432,29 +537,20 @@ class MaioApp(KivyMainApp):
         toggle_selected_filter = filter_button == self.root_layout.ids.menuBar.ids.listFilterSelected
         filtering = filter_button_state == 'down'
         if toggle_selected_filter:
-            self.change_app_state('filter_selected', filtering)
-            if filtering and self.filter_unselected:
-                self.change_app_state('filter_unselected', False)
+            self.change_app_states(filter_selected=filtering,
+                                   filter_unselected=self.filter_unselected and not filtering)
         else:
-            self.change_app_state('filter_unselected', filtering)
-            if filtering and self.filter_selected:
-                self.change_app_state('filter_selected', False)
+            self.change_app_states(filter_unselected=filtering,
+                                   filter_selected=self.filter_selected and not filtering)
 
         self.on_context_draw()
 
-    @staticmethod
-    def update_item_data(liw: Widget, item_name: str, state: str) -> ItemDataType:
-        """ update item_data of ListItem widget """
-        liw.item_data['id'] = item_name
-        if state == 'down':
-            liw.item_data['sel'] = 1
-        elif 'sel' in liw.item_data:
-            liw.item_data.pop('sel')
-        return liw.item_data
-
 
 class ListItem(BoxLayout):
     """ widget to display data item in list. """
+    is_context = BooleanProperty(False)     #: True if this item is the current context item (highlighted)
+    autoscroll_speed: float = 15.0          #: max. drag autoscroll speed in item heights per second
+
     def __init__(self, **kwargs):
         self.item_data = kwargs.pop('item_data', dict(id=''))
         self.list_idx = kwargs.pop('list_idx', -1)
@@ -466,6 +562,19 @@ class ListItem(BoxLayout):
         self.lcw = kivy_app.root.ids.listContainer
         self.dragged_from_list = None
         self.dragging_on_back = None
+        self._drag_bg = None
+        self._drag_touch = None
+        self._drag_trigger = None           # clock trigger of the drag steps, created on the first drag start
+        self._scroll_factor = 0.0           # scroll_y delta per pixel, calculated once at drag start
+        self._autoscroll_velocity = 0.0     # scroll_y delta per second
+        self._autoscroll_event = None
+
+        if self.main_app.batched_item_canvas:     # backgrounds/colors will be drawn by ListContainer
+            for wid in (self, self.ids.toggleSelected, self.ids.enterList, self.ids.dragHandle):
+                for canvas in (wid.canvas.before, wid.canvas, wid.canvas.after):
+                    canvas.remove_group(ITEM_CANVAS_GROUP)
+            self.ids.toggleSelected.bind(state=self.lcw.update_trigger)
+            self.bind(is_context=self.lcw.on_item_context)
 
     def on_touch_down(self, touch):
         """ move gliding list item widget """
@@ -474,32 +583,52 @@ class ListItem(BoxLayout):
 
         touch.grab(self)
         touch.ud[self] = 'drag'
+        self._drag_touch = touch
+        if not self._drag_trigger:
+            self._drag_trigger = Clock.create_trigger(self._drag_step)
+        self._scroll_factor = self.lcw.parent.convert_distance_to_scroll(0, 1)[1]
         self.dragged_from_list = self.main_app.current_list
         self.main_app.dragging_list_idx = self.list_idx
         assert self.list_idx == self.dragged_from_list.index(self.item_data)
         self.parent.remove_widget(self)
         self.x = touch.pos[0] - self.ids.dragHandle.x - self.ids.dragHandle.width / 2
         self.y = Window.mouse_pos[1] - self.height / 2
+        if self.main_app.batched_item_canvas:     # dragged item is no longer drawn by ListContainer
+            with self.canvas.before:
+                Color(rgba=self.main_app.context_path_ink, group=ITEM_CANVAS_GROUP)
+                self._drag_bg = Rectangle(pos=self.pos, size=self.size, group=ITEM_CANVAS_GROUP)
         self.app_root.add_widget(self)
         return True
 
     def on_touch_move(self, touch):
-        """ move gliding list item widget """
+        """ move gliding list item widget (coalescing all move events of a frame into one drag step) """
         if touch.grab_current is not self or touch.ud.get(self) != 'drag':
             return False
 
+        self._drag_trigger()
+        return True
+
+    def _drag_step(self, *_):
+        """ process the last touch position of a drag, timed as the hot path drag_step. """
+        with self.main_app.timings.measure('drag_step'):
+            self._drag_move()
+
+    def _drag_move(self):
+        """ move dragged item and update the drop indicator, the autoscroll and the back button drop zone. """
+        touch = self._drag_touch
         self.pos = touch.pos[0] - self.ids.dragHandle.x - self.ids.dragHandle.width / 2, touch.pos[1] - self.height / 2
+        if self._drag_bg:
+            self._drag_bg.pos = self.pos
 
         ma = self.main_app
         svw = self.lcw.parent
+        self._update_autoscroll(touch.pos[1], svw)
         if svw.collide_point(*svw.parent.to_local(*touch.pos)):
-            placeholders = list(ma.placeholders_above.values()) + list(ma.placeholders_below.values())
-            for child_idx, liw in enumerate(self.lcw.children):
-                lc_pos = self.lcw.to_local(*svw.to_local(*touch.pos))
-                if liw not in placeholders and liw.collide_point(*lc_pos) \
-                        and ma.create_placeholder(child_idx, liw, lc_pos[1]):
-                    self._restore_menu_bar()
-                    return True
+            lc_pos = self.lcw.to_local(*svw.to_local(*touch.pos))
+            liw = self.lcw.child_at(lc_pos[1])
+            if liw and ma.create_placeholder(liw, lc_pos[1]):
+                self._restore_menu_bar()
+                return
 
         mb = self.app_root.ids.menuBar
         bb = mb.children[-1]
@@ -509,14 +638,31 @@ class ListItem(BoxLayout):
                 self.dragging_on_back = bb
                 mb.remove_widget(bb)
                 ph = Factory.DropPlaceholder(size=bb.size)
-                ph.add_widget(Image(source='img/72/context_leave.png', allow_stretch=True, pos=bb.pos, size=bb.size))
+                ph.add_widget(Image(source='atlas://img/icons72/context_leave', allow_stretch=True,
+                                    pos=bb.pos, size=bb.size))
                 mb.add_widget(ph, index=len(mb.children))
-        elif touch.pos[1] < self.height:
-            svw.scroll_y = min(max(0, svw.scroll_y - svw.convert_distance_to_scroll(0, self.height)[1]), 1)
-        elif touch.pos[1] > svw.top - self.height:
-            svw.scroll_y = min(max(0, svw.scroll_y + svw.convert_distance_to_scroll(0, self.height)[1]), 1)
 
-        return True
+    def _update_autoscroll(self, touch_y: float, svw: Widget):
+        """ start/stop autoscroll with a velocity proportional to the depth of the touch into an edge zone. """
+        zone = self.height
+        depth = 0.0
+        if svw.y <= touch_y < svw.y + zone:
+            depth = (touch_y - svw.y - zone) / zone
+        elif svw.top - zone < touch_y <= svw.top:
+            depth = (touch_y - svw.top + zone) / zone
+        self._autoscroll_velocity = depth * self.autoscroll_speed * zone * self._scroll_factor
+
+        if self._autoscroll_velocity and not self._autoscroll_event:
+            self._autoscroll_event = Clock.schedule_interval(self._autoscroll, 0)
+        elif not self._autoscroll_velocity and self._autoscroll_event:
+            self._autoscroll_event.cancel()
+            self._autoscroll_event = None
+
+    def _autoscroll(self, dt: float):
+        """ scroll list on each frame while dragging within an edge zone, independent of the touch event rate. """
+        svw = self.lcw.parent
+        svw.scroll_y = min(max(0, svw.scroll_y + self._autoscroll_velocity * dt), 1)
+        self._drag_trigger()        # update drop slot under the (maybe not moving) touch
 
     def on_touch_up(self, touch):
         """ drop / finish drag """
@@ -525,32 +671,44 @@ class ListItem(BoxLayout):
         if touch.ud[self] != 'drag':
             return False
 
+        if self._drag_trigger.is_triggered:
+            self._drag_trigger.cancel()
+            self._drag_step()       # process last move event (coalesced with the release) before the drop
+        if self._autoscroll_event:
+            self._autoscroll_event.cancel()
+            self._autoscroll_event = None
+        self._drag_touch = None
         ma = self.main_app
 
-        if self.dragging_on_back or ma.placeholders_above or ma.placeholders_below:
+        if self.dragging_on_back or ma.drop_slot:
+            src_list = self.dragged_from_list
+            assert src_list.index(self.item_data) == self.list_idx
+            moved_items = [self.item_data]
+            if ma.multi_drag and self.item_data.get('sel'):
+                moved_items = [lid for lid in src_list if lid.get('sel')]
             if self.dragging_on_back:
-                _, dst_list = self.main_app.get_context_list(path_end_idx=-1)
-                list_idx = 0
-            elif ma.placeholders_above and ma.placeholders_below:   # drop into sub list
-                list_idx = list(ma.placeholders_below.keys())[0]
-                dst_list = self.dragged_from_list[list_idx]['sub_list']
+                _, dst_list = ma.get_context_list(path_end_idx=-1)
                 list_idx = 0
             else:
-                dst_list = self.dragged_from_list
-                if ma.placeholders_above:
-                    list_idx = list(ma.placeholders_above.keys())[0]
+                list_idx, part = ma.drop_slot
+                if part == 'into':      # drop into sub list
+                    dst_item = src_list[list_idx]
+                    dst_list = dst_item['sub_list']
+                    list_idx = 0
+                    moved_items = [lid for lid in moved_items if lid is not dst_item]
                 else:
-                    list_idx = list(ma.placeholders_below.keys())[0] + 1
-            assert self.dragged_from_list.index(self.item_data) == self.list_idx
-            self.dragged_from_list.remove(self.item_data)
-            if list_idx != 0:
-                self.main_app.set_context(self.item_data['id'], redraw=False)
-            if list_idx > self.list_idx:
-                list_idx -= 1
-            dst_list.insert(list_idx, self.item_data)
+                    dst_list = src_list
+                    if part == 'below':
+                        list_idx += 1
+            if dst_list is src_list:
+                ma.set_context(self.item_data['id'], redraw=False)
+            ma.move_items(moved_items, src_list, dst_list, list_idx)
 
         self.dragged_from_list = None
         ma.dragging_list_idx = None
+        if self._drag_bg:
+            self.canvas.before.remove_group(ITEM_CANVAS_GROUP)
+            self._drag_bg = None
         self._restore_menu_bar()
         self.app_root.remove_widget(self)
         ma.cleanup_placeholder()
@@ -569,6 +727,157 @@ class ListItem(BoxLayout):
             self.dragging_on_back = None
 
 
+class ListContainer(BoxLayout):
+    """ container of the list item widgets, optionally drawing the backgrounds of all items in a single batch.
+
+    In batched mode (:attr:`MaioApp.batched_item_canvas`) the background quads of all list items get collected
+    into one :class:`~kivy.graphics.Mesh` per ink color and the context item frame gets drawn by a single
+    :class:`~kivy.graphics.Line`, so that the number of draw calls no longer depends on the number of items.
+    Big lists get split into several meshes of up to :data:`MESH_MAX_QUADS` quads. The batched item backgrounds
+    are plain rectangles (instead of the rounded and ellipse shapes of the non-batched mode).
+
+    The y positions of the children are indexed after each layout, for to find the child widget at a position
+    with a bisect (see :meth:`child_at`).
+
+    The drop target of a drag&drop is shown by a single drop indicator, drawn in canvas.after of this container
+    and repositioned by :meth:`show_drop_indicator`, so that the container children get not changed while dragging.
+    """
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self._child_bottoms: List[float] = list()       # child y positions, ascending in the order of self.children
+        self._frame_liw: Optional[Widget] = None        # highlighted ListItem widget framed in batched mode
+        self.bind(children=self._invalidate_child_bottoms)
+        self.update_trigger = Clock.create_trigger(self.update_item_canvas)
+        with self.canvas.before:
+            self._ctx_color = Color()
+            self._ctx_meshes = InstructionGroup()
+            self._sel_color = Color()
+            self._sel_meshes = InstructionGroup()
+            self._unsel_color = Color()
+            self._unsel_meshes = InstructionGroup()
+        with self.canvas.after:
+            self._frame_color = Color(rgba=(0, 0, 0, 0))
+            self._frame_line = Line(width=sp(1.8))
+            self._drop_color = Color(rgba=(0, 0, 0, 0))
+            self._drop_rect = RoundedRectangle()
+
+    def _invalidate_child_bottoms(self, *_):
+        self._child_bottoms = list()    # child positions are outdated until the next layout
+
+    def child_at(self, y: float) -> Optional[Widget]:
+        """ determine the child widget covering the passed y coordinate.
+
+        :param y:       y coordinate (relative to this container).
+        :return:        child widget or None if not found or if the layout of the container is outdated.
+        """
+        bottoms = self._child_bottoms
+        child_idx = bisect_right(bottoms, y) - 1
+        if child_idx >= 0:
+            child = self.children[child_idx]
+            if y < child.top:
+                return child
+        return None
+
+    def show_drop_indicator(self, liw: Optional[Widget], part: str):
+        """ move the drop indicator onto a drop slot, or hide it.
+
+        :param liw:     ListItem widget of the drop slot or None for to hide the drop indicator.
+        :param part:    part of the drop slot: 'above', 'below' or 'into' (the sub_list of liw).
+        """
+        if liw is None:
+            self._drop_color.rgba = (0, 0, 0, 0)
+            return
+
+        main_app = App.get_running_app().main_app
+        if part == 'into':
+            self._drop_color.rgba = main_app.context_id_ink
+            self._drop_rect.pos = liw.pos
+            self._drop_rect.size = liw.size
+        else:
+            height = liw.height / 2.7
+            self._drop_color.rgba = main_app.context_path_ink
+            self._drop_rect.pos = liw.x, (liw.top if part == 'above' else liw.y) - height / 2
+            self._drop_rect.size = liw.width, height
+
+    def do_layout(self, *largs):
+        """ overwritten for to re-index the children positions and to update the batched item canvas. """
+        super().do_layout(*largs)
+        self._child_bottoms = [child.y for child in self.children]
+        self.update_trigger()
+
+    def update_item_canvas(self, *_):
+        """ rebuild the meshes of the item backgrounds on layout/selection changes (only used in batched mode). """
+        main_app = App.get_running_app().main_app
+        if not main_app.batched_item_canvas:
+            return
+
+        ctx_quads: List[float] = list()
+        sel_quads: List[float] = list()
+        unsel_quads: List[float] = list()
+        for liw in self.children:
+            toggle = liw.ids.toggleSelected
+            ink_quads = sel_quads if toggle.state == 'down' else unsel_quads
+            _add_quad(ink_quads, toggle)
+            for wid in (liw.ids.enterList, liw.ids.dragHandle):
+                if wid.width:
+                    _add_quad(ctx_quads, wid)
+                    _add_quad(ink_quads, wid)
+
+        for color, meshes, quads, ink in ((self._ctx_color, self._ctx_meshes, ctx_quads, main_app.context_id_ink),
+                                          (self._sel_color, self._sel_meshes, sel_quads, main_app.selected_item_ink),
+                                          (self._unsel_color, self._unsel_meshes, unsel_quads,
+                                           main_app.unselected_item_ink)):
+            color.rgba = ink
+            _update_meshes(meshes, quads)
+
+        self.update_context_frame()
+
+    def on_item_context(self, liw: Widget, is_context: bool):
+        """ move only the context item frame on a change of the highlighted list item (only used in batched mode). """
+        if is_context:
+            self._frame_liw = liw
+        elif liw is self._frame_liw:
+            self._frame_liw = None
+        self.update_context_frame()
+
+    def update_context_frame(self):
+        """ move the context item frame onto the highlighted list item or hide it (only used in batched mode). """
+        frame_liw = self._frame_liw
+        if frame_liw and frame_liw.parent is self:
+            self._frame_color.rgba = App.get_running_app().main_app.context_id_ink[:3] + (.69, )
+            self._frame_line.rectangle = (frame_liw.x + sp(2), frame_liw.y + sp(2),
+                                          frame_liw.width - sp(4), frame_liw.height - sp(4))
+        else:
+            self._frame_color.rgba = (0, 0, 0, 0)
+
+
+def _update_meshes(meshes: InstructionGroup, quads: List[float]):
+    """ put the quads vertex list into the meshes of an instruction group, with up to MESH_MAX_QUADS quads per mesh.
+
+    The meshes of the last update get reused, missing meshes get added and unused meshes get removed.
+    """
+    chunk_len = MESH_MAX_QUADS * 16                 # 4 vertices per quad, each with the 4 values x, y, u, v
+    chunk_starts = range(0, len(quads), chunk_len)
+    old_meshes = list(meshes.children)
+    for mesh_idx, start in enumerate(chunk_starts):
+        vertices = quads[start:start + chunk_len]
+        indices = [vx_idx + offset for vx_idx in range(0, len(vertices) // 4, 4) for offset in (0, 1, 2, 2, 3, 0)]
+        if mesh_idx < len(old_meshes):
+            old_meshes[mesh_idx].vertices = vertices
+            old_meshes[mesh_idx].indices = indices
+        else:
+            meshes.add(Mesh(mode='triangles', vertices=vertices, indices=indices))
+    for mesh in old_meshes[len(chunk_starts):]:
+        meshes.remove(mesh)
+
+
+def _add_quad(quads: List[float], wid: Widget):
+    """ add the vertices (x, y, u, v) of the rectangle covered by the widget wid to the quads vertex list. """
+    x, y = wid.pos
+    r, t = x + wid.width, y + wid.height
+    quads.extend((x, y, 0, 0, r, y, 1, 0, r, t, 1, 1, x, t, 0, 1))
+
+
 class DropPlaceholder(Widget):
     """ placeholder for to display screen box to drop a dragged item onto """
     def __init__(self, **kwargs):
@@ -576,6 +885,38 @@ class DropPlaceholder(Widget):
         super().__init__(**kwargs)
 
 
+class ContextSnapshot(Widget):
+    """ texture snapshot of the list view, animated on context changes instead of the live widgets. """
+    texture = ObjectProperty(None, allownone=True)      #: texture rendered by :func:`snapshot_texture`
+
+
+def snapshot_texture(wid: Widget) -> Any:
+    """ render the canvas of a widget (including its children) once into the texture of a frame buffer object.
+
+    :param wid:     widget to capture.
+    :return:        texture with the current visual content of the widget.
+    """
+    # detach canvas from the parent canvas while rendered into the fbo (like kivy.uix.widget.Widget.export_as_image)
+    parent_canvas = wid.parent.canvas if wid.parent else None
+    canvas_idx = parent_canvas.indexof(wid.canvas) if parent_canvas else -1
+    if canvas_idx > -1:
+        parent_canvas.remove(wid.canvas)
+
+    fbo = Fbo(size=wid.size, with_stencilbuffer=True)
+    with fbo:
+        ClearColor(0, 0, 0, 0)
+        ClearBuffers()
+        Translate(-wid.x, -wid.y, 0)
+    try:
+        fbo.add(wid.canvas)
+        fbo.draw()
+        fbo.remove(wid.canvas)
+    finally:
+        if canvas_idx > -1:
+            parent_canvas.insert(canvas_idx, wid.canvas)
+    return fbo.texture
+
+
 # app start
 if __name__ in ('__android__', '__main__'):
     MaioApp(app_name='maio', app_title="Irmi's Shopping Lisz").run_app()
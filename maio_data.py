@@ -0,0 +1,136 @@
+""" data operations of the maio app, independent from any GUI framework. """
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+
+ItemDataType = Dict[str, Any]
+ListDataType = List[ItemDataType]
+
+COUNT_CANCEL_CHECK = 999                #: number of counted items between two checks of the cancel condition
+
+
+def delete_confirm_title(names: List[str], counts: Optional[List[int]] = None) -> str:
+    """ compile the bounded title of the delete confirmation popup.
+
+    :param names:       preview of the names of the items to delete.
+    :param counts:      number of the items to delete per level (index 0=item itself, 0 if only its sub-list gets
+                        deleted) or None if they are still getting counted.
+    :return:            title showing the preview names and the number of the not displayed items.
+    """
+    title = "Confirm deletion of item(s): " + ",".join(names)
+    if counts is None:
+        return title + " … and more (counting)"
+    more = sum(counts) - len(names)
+    if more > 0:
+        title += f" … and {more} more (" + "/".join(str(_) for _ in counts) + " per level)"
+    return title
+
+
+class MaioDataMixin:
+    """ item data tree operations of the maio app (used by MaioApp and for to run/benchmark them headless). """
+    context_path: List[str]                                 #: context path app state (provided by MainAppBase)
+    data_tree: ListDataType = list()                        #: app data
+
+    current_list: ListDataType = list()             #: item data of currently displayed sub-list
+    data_version: int = 0                           #: mutation counter of data_tree (invalidates cached list views)
+
+    def find_item_index(self, item_name: str, searched_list: Optional[ListDataType] = None) -> int:
+        """ determine list index in the currently displayed list. """
+        if searched_list is None:
+            searched_list = self.current_list
+        for list_idx, data in enumerate(searched_list):
+            if data['id'] == item_name:
+                return list_idx
+        return -1
+
+    def get_context_list(self, path_end_idx: Optional[int] = None):
+        """ get list name and data of the current context list. """
+        current_list = self.data_tree
+        sub_list_name = ''
+        for sub_list_name in self.context_path[:path_end_idx]:
+            current_list = self.get_item_by_name(sub_list_name, searched_list=current_list)['sub_list']
+        return sub_list_name, current_list
+
+    def get_item_by_name(self, item_name: str, searched_list: Optional[ListDataType] = None) -> ItemDataType:
+        """ search list item in current list """
+        if searched_list is None:
+            searched_list = self.current_list
+        lx = self.find_item_index(item_name, searched_list=searched_list)
+        if lx != -1:
+            return searched_list[lx]
+        return dict(id='')
+
+    def item_selection_toggled(self):
+        """ invalidate the cached list views after the user toggled the selection of an item. """
+        self.data_version += 1
+
+    def iter_sub_items(self, item_name: str, sub_list_only: bool, searched_list: Optional[ListDataType] = None
+                       ) -> Iterator[Tuple[int, str]]:
+        """ lazily iterate over the names of an item and of all its sub-list items (depth-first).
+
+        :param item_name:       name of the item.
+        :param sub_list_only:   pass True for to exclude the item itself.
+        :param searched_list:   list containing the item (default=current list).
+        :return:                generator yielding tuples of the level (0=item itself) and the name of each item.
+        """
+        if not sub_list_only:
+            yield 0, item_name
+        stack = [iter(self.get_item_by_name(item_name, searched_list).get('sub_list', ()))]
+        while stack:
+            for sub_item in stack[-1]:
+                yield len(stack), sub_item['id']
+                if sub_item.get('sub_list'):
+                    stack.append(iter(sub_item['sub_list']))
+                    break
+            else:
+                stack.pop()
+
+    def count_sub_items(self, item_name: str, sub_list_only: bool, searched_list: Optional[ListDataType] = None,
+                        is_cancelled: Optional[Callable[[], bool]] = None) -> Optional[List[int]]:
+        """ count the items of an item and of all its sub-lists per level (e.g. run in a background thread).
+
+        :param item_name:       name of the item.
+        :param sub_list_only:   pass True for to exclude the item itself.
+        :param searched_list:   list containing the item (default=current list).
+        :param is_cancelled:    optional callable returning True for to cancel the counting.
+        :return:                list with the number of items per level (index 0=item itself) or None if cancelled.
+        """
+        counts: List[int] = list()
+        for idx, (level, _) in enumerate(self.iter_sub_items(item_name, sub_list_only, searched_list=searched_list)):
+            if is_cancelled and not idx % COUNT_CANCEL_CHECK and is_cancelled():
+                return None
+            if level >= len(counts):
+                counts.extend([0] * (level + 1 - len(counts)))
+            counts[level] += 1
+        return counts
+
+    def sub_item_names(self, item_name, sub_list_only, sub_list=None, sub_item_names=None):
+        """ return item names of item, including sub_list items (if exists). """
+        if sub_item_names is None:
+            sub_item_names = list()
+        sub_item_names.extend(name for _, name in self.iter_sub_items(item_name, sub_list_only, searched_list=sub_list))
+        return sub_item_names
+
+    def move_items(self, moved_items: ListDataType, src_list: ListDataType, dst_list: ListDataType, dst_idx: int):
+        """ move items in one pass from src_list into dst_list.
+
+        :param moved_items: list of the item data to move (in the order they get inserted into dst_list).
+        :param src_list:    list containing all the moved items.
+        :param dst_list:    destination list (can be src_list for to reorder items).
+        :param dst_idx:     index in dst_list (before the removal of the moved items) where the items get inserted.
+        """
+        moved_ids = set(map(id, moved_items))
+        if dst_list is src_list:
+            dst_idx -= sum(1 for lid in src_list[:dst_idx] if id(lid) in moved_ids)
+        src_list[:] = [lid for lid in src_list if id(lid) not in moved_ids]
+        dst_list[dst_idx:dst_idx] = moved_items
+        self.data_version += 1
+
+    @staticmethod
+    def update_item_data(liw: Any, item_name: str, state: str) -> ItemDataType:
+        """ update item_data of ListItem widget (also called by the kv rules on each build of a ListItem widget). """
+        liw.item_data['id'] = item_name
+        if state == 'down':
+            liw.item_data['sel'] = 1
+        elif 'sel' in liw.item_data:
+            liw.item_data.pop('sel')
+        return liw.item_data
@@ -1,11 +1,15 @@
 """ test ae.gui_app portion """
+import gc
 import os
 import pytest
 from typing import Dict, Any
 
 from ae.console import get_user_data_path
+from ae.core import DEBUG_LEVEL_VERBOSE
 
-from ae.gui_app import MainAppBase, APP_STATE_SECTION_NAME, app_state_keys
+from ae.gui_app import (
+    AppStateStore, EventBus, HotPathTimings, MainAppBase, APP_STATE_SECTION_NAME, APP_STATE_SNAPSHOT_EXT,
+    app_state_keys)
 
 
 TST_VAR = 'tst_var'
@@ -156,6 +160,21 @@ class TestAppState:
         assert app.save_app_states() == ""
         assert app.get_var(TST_VAR, section=APP_STATE_SECTION_NAME) == chg_val
 
+    def test_change_app_states(self, ini_file, restore_app_env):
+        app = ImplementationOfMainApp(additional_cfg_files=(ini_file,))
+        version = app.state_store.version
+        app.change_app_states(**{TST_VAR: 'batchVal', 'font_size': 36.9})
+        assert getattr(app, TST_VAR) == 'batchVal'
+        assert app.font_size == 36.9
+        assert app.framework_app.app_state[TST_VAR] == 'batchVal'
+        assert app.state_store.version == version + 2
+
+    def test_change_app_states_empty_framework_dict(self, ini_file, restore_app_env):
+        app = ImplementationOfMainApp(additional_cfg_files=(ini_file,))
+        app.framework_app.app_state.clear()
+        app.change_app_states(font_size=36.9)
+        assert app.framework_app.app_state == dict(font_size=36.9)
+
     def test_save_app_states(self, ini_file, restore_app_env):
         global TST_DICT
         app = ImplementationOfMainApp(additional_cfg_files=(ini_file,))
@@ -173,11 +192,89 @@ class TestAppState:
         finally:
             TST_DICT = old_dict
 
+    def test_save_app_states_frozen_and_ordered(self, ini_file, restore_app_env):
+        app = ImplementationOfMainApp(additional_cfg_files=(ini_file,))
+        app.change_app_state(TST_VAR, 'older')
+        older = app.prepare_app_states_save()
+        app.change_app_state(TST_VAR, ['newer'])
+        newer = app.prepare_app_states_save()
+        app.tst_var.append('changed after prepare')
+        assert app.write_app_states(newer) == ""
+        assert app.write_app_states(older) == ""        # skipped: newer app states got already written
+        assert app.app_states_saved("") == ""
+        app.load_app_states()
+        assert app.tst_var == ['newer']
+
     def test_save_app_states_exception(self, ini_file, restore_app_env):
         app = ImplementationOfMainApp(additional_cfg_files=(ini_file,))
         os.remove(ini_file)
         assert app.save_app_states() != ""
 
+    def test_snapshot_disabled(self, ini_file, restore_app_env):
+        app = ImplementationOfMainApp(additional_cfg_files=(ini_file,))
+        assert not os.path.exists(app._snapshot_file_path())
+
+    def test_snapshot_load(self, ini_file, restore_app_env):
+        app = ImplementationOfMainApp(additional_cfg_files=(ini_file,))
+        app.app_state_snapshot = True
+        snapshot_file = app._snapshot_file_path()
+        assert snapshot_file.endswith(APP_STATE_SNAPSHOT_EXT)
+        try:
+            app.load_app_states()
+            assert os.path.exists(snapshot_file)
+            assert app._read_snapshot()[0] == app._snapshot_key()
+            app.tst_var = ''
+            app.load_app_states()
+            assert app.tst_var == TST_VAL
+        finally:
+            if os.path.exists(snapshot_file):
+                os.remove(snapshot_file)
+
+    def test_snapshot_external_edit_wins(self, ini_file, restore_app_env):
+        app = ImplementationOfMainApp(additional_cfg_files=(ini_file,))
+        app.app_state_snapshot = True
+        snapshot_file = app._snapshot_file_path()
+        try:
+            app.load_app_states()
+            with open(ini_file, 'w') as file_handle:
+                file_handle.write(f"[{APP_STATE_SECTION_NAME}]\n{TST_VAR} = changedVal\n")
+            app.load_cfg_files()
+            app.load_app_states()
+            assert app.tst_var == 'changedVal'
+        finally:
+            if os.path.exists(snapshot_file):
+                os.remove(snapshot_file)
+
+    def test_snapshot_updated_on_save(self, ini_file, restore_app_env):
+        app = ImplementationOfMainApp(additional_cfg_files=(ini_file,))
+        app.app_state_snapshot = True
+        snapshot_file = app._snapshot_file_path()
+        try:
+            app.change_app_state(TST_VAR, 'savedVal')
+            assert app.save_app_states() == ""
+            snapshot_key, states = app._read_snapshot()
+            assert snapshot_key == app._snapshot_key()
+            assert states[TST_VAR][1] == 'savedVal'
+        finally:
+            if os.path.exists(snapshot_file):
+                os.remove(snapshot_file)
+
+    def test_snapshot_literals_on_save(self, ini_file, restore_app_env):
+        app = ImplementationOfMainApp(additional_cfg_files=(ini_file,))
+        app.app_state_snapshot = True
+        snapshot_file = app._snapshot_file_path()
+        try:
+            app.change_app_state(TST_VAR, ['saved', '100%'])
+            assert app.save_app_states() == ""
+            _, states = app._read_snapshot()
+            assert states[TST_VAR] == (app._cfg_parser.get(APP_STATE_SECTION_NAME, TST_VAR), ['saved', '100%'])
+            app.tst_var = ''
+            app.load_app_states()
+            assert app.tst_var == ['saved', '100%']
+        finally:
+            if os.path.exists(snapshot_file):
+                os.remove(snapshot_file)
+
     def test_set_font_size(self, ini_file, restore_app_env):
         app = ImplementationOfMainApp(additional_cfg_files=(ini_file,))
         assert app.font_size == 0.0
@@ -189,6 +286,127 @@ class TestAppState:
         assert app.context_draw_called
 
 
+class TestAppStateStore:
+    def test_keys_loaded_once(self, ini_file, restore_app_env):
+        app = ImplementationOfMainApp(additional_cfg_files=(ini_file,))
+        assert app.state_store.keys == (TST_VAR, )
+        assert app.state_store.snapshot() == TST_DICT
+
+    def test_changed_versions(self):
+        store = AppStateStore(owner=None)
+        assert store.changed('a') == 1
+        assert store.changed('b') == 2
+        assert store.changed('a') == 3
+        assert store.key_versions == dict(a=3, b=2)
+
+    def test_delta(self, ini_file, restore_app_env):
+        app = ImplementationOfMainApp(additional_cfg_files=(ini_file,))
+        version = app.state_store.version
+        assert app.state_store.delta(version) == dict()
+        app.change_app_state(TST_VAR, 'deltaVal')
+        assert app.state_store.delta(version) == {TST_VAR: 'deltaVal'}
+        assert app.state_store.delta(app.state_store.version) == dict()
+
+
+class TestEventBus:
+    def test_dispatch_without_handlers(self):
+        bus = EventBus()
+        assert bus.dispatch('on_any_event') is None
+
+    def test_owner_handler_attached_after_dispatch(self):
+        class Owner:
+            pass
+        owner = Owner()
+        bus = EventBus(owner=owner)
+        assert bus.dispatch('on_evt') is None
+        owner.on_evt = lambda: 'attached'
+        assert bus.dispatch('on_evt') == 'attached'
+
+    def test_owner_handler(self, ini_file, restore_app_env):
+        app = ImplementationOfMainApp(additional_cfg_files=(ini_file,))
+        bus = EventBus(owner=app)
+        assert bus.dispatch('on_context_draw') is None
+        assert app.context_draw_called
+
+    def test_subscribers_priority(self):
+        calls = list()
+        bus = EventBus()
+        bus.subscribe('on_evt', lambda: calls.append('low'), priority=-3)
+        bus.subscribe('on_evt', lambda: calls.append('default'))
+        bus.subscribe('on_evt', lambda: calls.append('high'), priority=3)
+        bus.dispatch('on_evt')
+        assert calls == ['high', 'default', 'low']
+
+    def test_short_circuit(self):
+        calls = list()
+        bus = EventBus()
+        bus.subscribe('on_key_press', lambda key: calls.append(key) or True, priority=1)
+        bus.subscribe('on_key_press', lambda key: calls.append(key * 2))
+        assert bus.dispatch('on_key_press', 'x') is True
+        assert calls == ['x']
+
+    def test_unsubscribe_invalidates_cache(self):
+        calls = list()
+        bus = EventBus()
+        callback = calls.append
+        bus.subscribe('on_evt', callback)
+        bus.dispatch('on_evt', 1)
+        bus.unsubscribe('on_evt', callback)
+        bus.dispatch('on_evt', 2)
+        assert calls == [1]
+
+    def test_call_event_with_subscriber(self, ini_file, restore_app_env):
+        app = ImplementationOfMainApp(additional_cfg_files=(ini_file,))
+        calls = list()
+        app.event_bus.subscribe('on_context_draw', lambda: calls.append('sub'))
+        assert app.call_event('on_context_draw') is None
+        assert app.context_draw_called
+        assert calls == ['sub']
+
+
+class TestHotPathTimings:
+    def test_disabled_by_default(self):
+        timings = HotPathTimings()
+        with timings.measure('tst_path'):
+            pass
+        assert timings.durations == dict()
+        assert timings.statistics() == dict()
+
+    def test_ring_buffer(self):
+        timings = HotPathTimings(samples=3)
+        timings.enabled = True
+        for _ in range(6):
+            with timings.measure('tst_path'):
+                pass
+        assert len(timings.durations['tst_path']) == 3
+
+    def test_statistics(self):
+        timings = HotPathTimings()
+        timings.durations['tst_path'] = [0.004, 0.001, 0.003, 0.002, 0.005]
+        assert timings.statistics() == {'tst_path': (5, 0.003, 0.005, 0.005)}
+        assert 'tst_path' in timings.report()
+
+    def test_dump(self, restore_app_env):
+        fn = 'tests/tst_timings.txt'
+        timings = HotPathTimings()
+        timings.durations['tst_path'] = [0.001]
+        try:
+            assert timings.dump(fn) == ""
+            with open(fn) as file_handle:
+                assert 'tst_path' in file_handle.read()
+        finally:
+            if os.path.exists(fn):
+                os.remove(fn)
+
+    def test_call_event_timed(self, ini_file, restore_app_env):
+        app = ImplementationOfMainApp(additional_cfg_files=(ini_file,))
+        app.timings.enabled = True
+        app.call_event('on_context_draw')
+        app.save_app_states()
+        assert len(app.timings.durations['on_context_draw']) == 1
+        assert len(app.timings.durations['save_app_states']) == 1
+
+
 class TestOtherMainAppMethods:
     def test_call_event_valid_method(self, ini_file, restore_app_env):
         app = ImplementationOfMainApp(additional_cfg_files=(ini_file,))
@@ -226,6 +444,36 @@ class TestOtherMainAppMethods:
             if os.path.exists(ini_file_path):
                 os.remove(ini_file_path)
 
+    def test_startup_phases(self, ini_file, restore_app_env):
+        app = ImplementationOfMainApp(additional_cfg_files=(ini_file,))
+        assert list(app.startup_phases) == ['updater_check', 'config_load', 'app_state_load', 'app_init']
+        assert 'total=' in app.startup_report()
+
+    def test_on_first_frame(self, ini_file, restore_app_env):
+        app = ImplementationOfMainApp(additional_cfg_files=(ini_file,))
+        called = list()
+        app.event_bus.subscribe('on_app_first_frame', lambda: called.append(True))
+        app.on_first_frame()
+        assert 'first_frame' in app.startup_phases
+        assert called == [True]
+
+    def test_lazy_dpo_disabled(self, ini_file, restore_app_env):
+        app = ImplementationOfMainApp(additional_cfg_files=(ini_file,))
+        app.debug_level = 0
+        called = list()
+        app.lazy_dpo(lambda: called.append(True) or "msg")
+        assert not called
+
+    def test_lazy_dpo_enabled(self, ini_file, restore_app_env, capsys):
+        gc.collect()                    # finalize the apps of previous tests before the output gets captured
+        app = ImplementationOfMainApp(additional_cfg_files=(ini_file,))
+        app.debug_level = DEBUG_LEVEL_VERBOSE
+        app.lazy_dpo("tst {:3} {}", 9, 'lazy')
+        app.lazy_dpo(lambda: "called lazy")
+        out = capsys.readouterr().out
+        assert "tst   9 lazy" in out
+        assert "called lazy" in out
+
     def test_play_beep(self, ini_file, restore_app_env):
         app = ImplementationOfMainApp(additional_cfg_files=(ini_file,))
         assert app.play_beep() is None
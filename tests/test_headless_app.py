@@ -0,0 +1,135 @@
+""" test ae.headless_app portion """
+import os
+import threading
+from types import SimpleNamespace
+
+import pytest
+
+from ae.gui_app import APP_STATE_SECTION_NAME
+from ae.headless_app import HeadlessFrameworkApp, HeadlessMainApp
+
+from maio_data import MaioDataMixin, delete_confirm_title
+
+
+TST_DATA_TREE = [dict(id='a', sub_list=[dict(id='b'), dict(id='c', sub_list=[dict(id='d')])]), dict(id='e')]
+
+
+@pytest.fixture
+def ini_file(restore_app_env):
+    """ provide test config file """
+    fn = 'tests/tst_headless.ini'
+    with open(fn, 'w') as file_handle:
+        file_handle.write(f"[{APP_STATE_SECTION_NAME}]\n"
+                          f"context_id = ''\ncontext_path = []\nfont_size = 21.0\ndata_tree = {TST_DATA_TREE!r}\n")
+    yield fn
+    if os.path.exists(fn):
+        os.remove(fn)
+
+
+class HeadlessMaioApp(MaioDataMixin, HeadlessMainApp):
+    """ headless app driving the data operations of the maio app """
+    draw_count = 0
+
+    def on_context_draw(self):
+        """ determine current list like MaioApp.on_context_draw, but without creating any widgets. """
+        self.current_list = self.get_context_list()[1]
+        self.draw_count += 1
+
+
+class TestHeadlessMainApp:
+    def test_framework_app(self, ini_file, restore_app_env):
+        app = HeadlessMainApp(additional_cfg_files=(ini_file,))
+        assert isinstance(app.framework_app, HeadlessFrameworkApp)
+        assert app.framework_app.app_state['context_path'] == []
+
+    def test_change_app_state_duplicate(self, ini_file, restore_app_env):
+        app = HeadlessMainApp(additional_cfg_files=(ini_file,))
+        app.change_app_state('font_size', 27.0)
+        assert app.font_size == 27.0
+        assert app.framework_app.app_state['font_size'] == 27.0
+
+    def test_run_app_without_events(self, ini_file, restore_app_env):
+        app = HeadlessMainApp(additional_cfg_files=(ini_file,))
+        assert app.run_app() == "0"
+
+    def test_run_scripted_events(self, ini_file, restore_app_env):
+        app = HeadlessMainApp(additional_cfg_files=(ini_file,))
+        called = list()
+        app.event_bus.subscribe('on_tst_event', called.append)
+        app.script_event('on_tst_event', 1)
+        app.script_event('on_tst_event', 2)
+        assert app.run_app() == "2"
+        assert called == [1, 2]
+
+    def test_stop(self, ini_file, restore_app_env):
+        app = HeadlessMainApp(additional_cfg_files=(ini_file,))
+        app.event_bus.subscribe('on_tst_event', lambda: app.framework_app.stop())
+        app.script_event('on_tst_event')
+        app.script_event('on_tst_event')
+        assert app.run_app() == "1"
+
+
+class TestHeadlessMaioApp:
+    def test_navigation(self, ini_file, restore_app_env):
+        app = HeadlessMaioApp(additional_cfg_files=(ini_file,))
+        app.script_event('context_enter', 'a')
+        app.script_event('context_enter', 'c')
+        assert app.run_app() == "2"
+        assert app.context_path == ['a', 'c']
+        assert app.current_list == [dict(id='d')]
+        assert app.draw_count == 2
+
+    def test_data_ops(self, ini_file, restore_app_env):
+        app = HeadlessMaioApp(additional_cfg_files=(ini_file,))
+        app.set_context('a')
+        assert app.sub_item_names('a', True) == ['b', 'c', 'd']
+        root_list = app.current_list
+        app.move_items([root_list[1]], root_list, root_list, 0)
+        assert [_['id'] for _ in app.data_tree] == ['e', 'a']
+        assert app.data_version == 1
+
+    def test_selection_keeps_cached_list_views(self, ini_file, restore_app_env):
+        app = HeadlessMaioApp(additional_cfg_files=(ini_file,))
+        drawn_version = app.data_version
+        liw = SimpleNamespace(item_data=dict(id='b', sel=1))
+        app.update_item_data(liw, 'b', 'normal')    # rebuild of a selected item: kv rules reset the toggle state
+        app.update_item_data(liw, 'b', 'down')      # .. and create_item_widgets() restores it
+        assert liw.item_data == dict(id='b', sel=1)
+        assert app.data_version == drawn_version    # cached list view of the rebuilt list is still valid
+
+        app.update_item_data(liw, 'b', 'normal')
+        app.item_selection_toggled()
+        assert app.data_version == drawn_version + 1
+
+    def test_save_load(self, ini_file, restore_app_env):
+        app = HeadlessMaioApp(additional_cfg_files=(ini_file,))
+        app.timings.enabled = True
+        app.context_enter('a')
+        app.get_item_by_name('b', searched_list=app.current_list)['sel'] = 1
+        assert app.save_app_states() == ""
+        app.load_app_states()
+        assert app.data_tree[0]['sub_list'][0] == dict(id='b', sel=1)
+        assert app.context_path == ['a']
+        assert app.timings.statistics()['save_app_states'][0] == 1
+
+    def test_iter_sub_items(self, ini_file, restore_app_env):
+        app = HeadlessMaioApp(additional_cfg_files=(ini_file,))
+        app.current_list = app.data_tree
+        assert list(app.iter_sub_items('a', False)) == [(0, 'a'), (1, 'b'), (1, 'c'), (2, 'd')]
+        assert list(app.iter_sub_items('a', True)) == [(1, 'b'), (1, 'c'), (2, 'd')]
+        assert list(app.iter_sub_items('e', True)) == []
+        assert app.sub_item_names('a', False) == ['a', 'b', 'c', 'd']
+
+    def test_count_sub_items(self, ini_file, restore_app_env):
+        app = HeadlessMaioApp(additional_cfg_files=(ini_file,))
+        assert app.count_sub_items('a', False, searched_list=app.data_tree) == [1, 2, 1]
+        assert app.count_sub_items('a', True, searched_list=app.data_tree) == [0, 2, 1]
+        cancel = threading.Event()
+        cancel.set()
+        assert app.count_sub_items('a', False, searched_list=app.data_tree, is_cancelled=cancel.is_set) is None
+
+    def test_delete_confirm_title(self):
+        assert delete_confirm_title(['a', 'b'], [1, 1]) == "Confirm deletion of item(s): a,b"
+        assert delete_confirm_title(['a', 'b']).endswith("a,b … and more (counting)")
+        assert delete_confirm_title(['a', 'b'], [1, 2, 3000]).endswith("a,b … and 3001 more (1/2/3000 per level)")
+        assert delete_confirm_title(['b', 'c'], [0, 2, 9]).endswith("b,c … and 9 more (0/2/9 per level)")
@@ -1,10 +1,16 @@
 """ test ae.kivy_app portion """
+import asyncio
 import os
+import pickle
 import pytest
 from ae.core import DEBUG_LEVEL_VERBOSE
+import kivy
+from kivy.cache import Cache
+from kivy.factory import Factory
+from kivy.lang import Builder
 
 from ae.gui_app import APP_STATE_SECTION_NAME
-from ae.kivy_app import KivyMainApp
+from ae.kivy_app import BUBBLE_MESSAGES, KV_CACHE_EXT, KivyMainApp, load_kv_cached, preload_atlas
 
 TST_VAR = 'win_rectangle'
 TST_VAL = (90, 60, 900, 600)
@@ -193,6 +199,145 @@ class TestAppState:
         assert app.on_context_called
 
 
+class TestAppStateProperties:
+    def test_init_app_state(self, ini_file, restore_app_env):
+        app = KivyMainApp(additional_cfg_files=(ini_file,))
+        assert app.framework_app.property(TST_VAR, quiet=True) is not None
+        assert getattr(app.framework_app, TST_VAR) == TST_VAL
+
+    def test_change_app_state_property(self, ini_file, restore_app_env):
+        app = KivyMainApp(additional_cfg_files=(ini_file,))
+        chg_val = (3, 6, 9, 12)
+        app.change_app_state(TST_VAR, chg_val)
+        app.dispatch_app_states()
+        assert getattr(app.framework_app, TST_VAR) == chg_val
+
+    def test_bindings_fired_per_change(self, ini_file, restore_app_env):
+        app = KivyMainApp(additional_cfg_files=(ini_file,))
+        fa = app.framework_app
+        fa.init_app_state(dict(context_id='', context_path=list()))
+        fired = {key: 0 for key in fa.app_state}
+
+        def _counter(key):
+            def _inc(*_):
+                fired[key] += 1
+            return _inc
+        for state_key in fired:
+            fa.bind(**{state_key: _counter(state_key)})
+
+        app.change_app_state(TST_VAR, (3, 6, 9, 12))
+        app.dispatch_app_states()
+        assert fired == {TST_VAR: 1, 'context_id': 0, 'context_path': 0}
+
+        app.change_app_state('context_id', 'tstCtx')
+        app.dispatch_app_states()
+        app.change_app_state('context_id', 'tstCtx')        # unchanged value does not dispatch
+        app.dispatch_app_states()
+        assert fired == {TST_VAR: 1, 'context_id': 1, 'context_path': 0}
+
+        app.context_path.append('tstCtx')
+        app.change_app_state('context_path', app.context_path)     # in-place change of list gets dispatched
+        app.dispatch_app_states()
+        assert fired == {TST_VAR: 1, 'context_id': 1, 'context_path': 1}
+
+        app.change_app_state('context_path', app.context_path)     # unchanged list does not dispatch
+        app.dispatch_app_states()
+        assert fired == {TST_VAR: 1, 'context_id': 1, 'context_path': 1}
+
+        app.change_app_states(context_path=app.context_path, context_id='otherCtx')
+        app.dispatch_app_states()
+        assert fired == {TST_VAR: 1, 'context_id': 2, 'context_path': 1}
+
+    def test_dispatch_once_per_frame(self, ini_file, restore_app_env):
+        app = KivyMainApp(additional_cfg_files=(ini_file,))
+        fa = app.framework_app
+        fa.init_app_state(dict(context_id='', context_path=list()))
+        fired = list()
+        fa.bind(context_id=lambda *_: fired.append('context_id'), context_path=lambda *_: fired.append('context_path'))
+
+        app.context_enter('a')                      # changing context_path and context_id
+        app.context_leave()
+        app.change_app_state('context_id', 'b')
+        assert fired == []                          # nothing dispatched until the clock trigger fires
+        assert fa.app_state['context_id'] == 'b'    # .. but the duplicate app state dict is already up-to-date
+
+        app.dispatch_app_states()
+        assert fired == ['context_id']              # context_path got restored, so it is not dispatched
+        assert fa.context_id == 'b'
+        assert fa.context_path == []
+
+
+class TestAsyncMode:
+    def test_run_in_background_without_loop(self, ini_file, restore_app_env):
+        app = KivyMainApp(additional_cfg_files=(ini_file,))
+        called = list()
+        assert app.run_in_background(called.append, 1) is None
+        assert called == [1]
+
+    def test_run_in_background_task(self, ini_file, restore_app_env):
+        app = KivyMainApp(additional_cfg_files=(ini_file,))
+        called = list()
+
+        async def _run():
+            task = app.run_in_background(called.append, 2)
+            assert task in app._tasks
+            await task
+            assert task not in app._tasks
+
+        asyncio.run(_run())
+        assert called == [2]
+
+    def test_save_app_states_task_coalescing(self, ini_file, restore_app_env):
+        app = KivyMainApp(additional_cfg_files=(ini_file,))
+
+        async def _run():
+            task = app.save_app_states_task()
+            assert app.save_app_states_task() is task
+            assert app._save_again
+            await task
+            assert app._save_task is not task
+            await app._save_task
+            await asyncio.sleep(0)          # let the done callback reload the config files
+            assert app._saved_seq == app._save_seq
+
+        asyncio.run(_run())
+
+    def test_save_app_states_task_error(self, ini_file, restore_app_env):
+        app = KivyMainApp(additional_cfg_files=(ini_file,))
+        saved = list()
+
+        def _write_error(_save_data):
+            raise OSError("tst write error")
+
+        app.write_app_states = _write_error
+        app.app_states_saved = saved.append
+
+        async def _run():
+            task = app.save_app_states_task()
+            app.save_app_states_task()
+            with pytest.raises(OSError):
+                await task
+            await asyncio.sleep(0)          # let the done callback pass the error and start the follow-up save
+            assert "tst write error" in saved[0]
+            assert app._save_task is not task
+            assert not app._save_again
+            with pytest.raises(OSError):
+                await app._save_task
+
+        asyncio.run(_run())
+
+    def test_cancel_tasks(self, ini_file, restore_app_env):
+        app = KivyMainApp(additional_cfg_files=(ini_file,))
+
+        async def _run():
+            app.save_app_states_task()
+            app.cancel_tasks()
+            assert not app._tasks
+            assert app._save_task is None
+
+        asyncio.run(_run())
+
+
 class TestHelperMethods:
     def test_call_event_valid_method(self, ini_file, restore_app_env):
         app = KivyAppTest(additional_cfg_files=(ini_file,))
@@ -282,12 +427,99 @@ class TestContext:
         assert app.context_id == ctx3
 
 
+class TestKvCache:
+    def test_load_kv_cached(self, tmp_path):
+        kv_file = str(tmp_path / 'tst.kv')
+        cache_file = kv_file + KV_CACHE_EXT
+        with open(kv_file, 'w') as file_handle:
+            file_handle.write("<TstKvCacheLabel@Label>:\n    text: 'tst' + str(self.width)\n")
+
+        root, parse_time, load_time = load_kv_cached(kv_file, cache_file)
+        assert root is None
+        assert parse_time > 0.0
+        assert load_time == 0.0
+        assert os.path.exists(cache_file)
+        Builder.unload_file(kv_file)
+
+        root, cached_parse_time, load_time = load_kv_cached(kv_file, cache_file)
+        assert cached_parse_time == parse_time
+        assert load_time > 0.0
+        assert Factory.TstKvCacheLabel().text.startswith('tst')
+
+    def test_load_kv_cache_of_other_kivy_version(self, tmp_path, monkeypatch):
+        kv_file = str(tmp_path / 'tst_ver.kv')
+        cache_file = kv_file + KV_CACHE_EXT
+        with open(kv_file, 'w') as file_handle:
+            file_handle.write("<TstKvCacheVerLabel@Label>:\n    text: 'tst_ver'\n")
+        monkeypatch.setattr(kivy, '__version__', '0.0.0')
+        load_kv_cached(kv_file, cache_file)
+        Builder.unload_file(kv_file)
+        monkeypatch.undo()
+
+        root, parse_time, load_time = load_kv_cached(kv_file, cache_file)
+        assert load_time == 0.0                 # outdated cache got ignored and overwritten
+        assert Factory.TstKvCacheVerLabel().text == 'tst_ver'
+        Builder.unload_file(kv_file)
+        assert load_kv_cached(kv_file, cache_file)[2] > 0.0
+
+    def test_load_kv_cache_with_incompatible_parser(self, tmp_path):
+        kv_file = str(tmp_path / 'tst_inc.kv')
+        cache_file = kv_file + KV_CACHE_EXT
+        with open(kv_file, 'w') as file_handle:
+            file_handle.write("<TstKvCacheIncLabel@Label>:\n    text: 'tst_inc'\n")
+        load_kv_cached(kv_file, cache_file)
+        Builder.unload_file(kv_file)
+        with open(cache_file, 'rb') as file_handle:
+            cache_key, parse_time, _parser = pickle.load(file_handle)
+        with open(cache_file, 'wb') as file_handle:
+            pickle.dump((cache_key, parse_time, dict(rules=[])), file_handle)    # Parser attributes missing
+
+        root, parse_time, load_time = load_kv_cached(kv_file, cache_file)
+        assert load_time == 0.0
+        assert Factory.TstKvCacheIncLabel().text == 'tst_inc'
+        Builder.unload_file(kv_file)
+
+    def test_load_kv_cache_outdated(self, tmp_path):
+        kv_file = str(tmp_path / 'tst.kv')
+        cache_file = kv_file + KV_CACHE_EXT
+        with open(kv_file, 'w') as file_handle:
+            file_handle.write("<TstKvCacheLabel@Label>:\n    text: 'tst'\n")
+        load_kv_cached(kv_file, cache_file)
+        Builder.unload_file(kv_file)
+
+        with open(kv_file, 'w') as file_handle:
+            file_handle.write("<TstKvCacheLabel@Label>:\n    text: 'changed'\n")
+        _, _, load_time = load_kv_cached(kv_file, cache_file)
+        assert load_time == 0.0
+        assert Factory.TstKvCacheLabel().text == 'changed'
+        Builder.unload_file(kv_file)
+
+
+class TestAtlas:
+    def test_preload_atlas(self):
+        Cache.remove('kv.atlas', 'img/icons72')
+        assert preload_atlas('img/icons72')
+        assert not preload_atlas('img/icons72')
+        atlas = Cache.get('kv.atlas', 'img/icons72')
+        assert atlas['add_item'].size == (72, 72)
+        assert atlas['add_item'].owner is atlas['del_item'].owner     # all icons share one texture
+
+
 class TestBubble:
     def test_show_bubble_cov(self, restore_app_env):
         app = KivyAppTest()
         app.set_opt('debugLevel', DEBUG_LEVEL_VERBOSE)
-        app.run_app()   # Builder.load_string(DEBUG_BUBBLE_DEF)
+        app.run_app()
         app.show_bubble("Test", 369, True)
+        app._render_bubble()     # Builder.load_string(DEBUG_BUBBLE_DEF)
+        assert app.info_bubble.message == "Test 369 True"
+
+    def test_show_bubble_ring_buffer(self, restore_app_env):
+        app = KivyAppTest()
+        for idx in range(BUBBLE_MESSAGES + 3):
+            app.show_bubble(idx)
+        assert len(app._bubble_messages) == BUBBLE_MESSAGES
+        assert app._bubble_messages[0] == (3, )
 
 
 class TestKeyEvents:
@@ -1,6 +1,8 @@
 """ unit tests for ae.updater portion. """
 import os
+import py_compile
 import shutil
+import sys
 import tempfile
 
 import pytest
@@ -173,6 +175,40 @@ class TestRunUpdater:
         check_local_bootstraps()
         assert os.path.exists(created_bootstrap)
 
+    def test_bootstrap_byte_compiled(self, created_bootstrap):
+        py_compile.compile(created_bootstrap, cfile=created_bootstrap + 'c')     # like python-for-android builds
+        os.remove(created_bootstrap)
+        assert check_local_bootstraps()
+
+    def test_updater_byte_compiled(self, created_run_updater):
+        py_compile.compile(created_run_updater, cfile=created_run_updater + 'c')
+        os.remove(created_run_updater)
+        assert check_local_updates()
+        assert not os.path.exists(created_run_updater + 'c')
+
+    def test_no_updater(self):
+        cwd = os.getcwd()
+        tmp_dir = tempfile.mkdtemp()
+        os.chdir(tmp_dir)
+        try:
+            assert not check_local_updates()
+            assert not check_local_bootstraps()
+        finally:
+            os.chdir(cwd)
+            shutil.rmtree(tmp_dir)
+
+    def test_updater_in_sys_path_ignored(self, created_run_updater):
+        tmp_dir = os.path.dirname(created_run_updater)
+        sys.path.insert(0, tmp_dir)
+        os.chdir(tempfile.mkdtemp())
+        try:
+            assert not check_local_updates()
+            assert os.path.exists(created_run_updater)
+        finally:
+            shutil.rmtree(os.getcwd())
+            os.chdir(tmp_dir)
+            sys.path.remove(tmp_dir)
+
 
 class TestCheckAll:
     def test_nothing_to_do(self):